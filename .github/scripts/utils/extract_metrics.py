@@ -1,14 +1,141 @@
 """Extract metrics from executed Jupyter notebooks."""
 
 import argparse
+import functools
 import json
+import math
 import sys
 import re
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
-import nbformat
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from datetime import datetime
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from ciso8601 import parse_datetime as parse_timestamp
+except ImportError:
+    if sys.version_info >= (3, 11):
+        # fromisoformat accepts the trailing "Z" Jupyter writes since 3.11
+        parse_timestamp = datetime.fromisoformat
+    else:
+        def parse_timestamp(value: str) -> datetime:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+# Common metric patterns as (name, value) pairs, each with the lowercase
+# substrings at least one of which must occur in the text for it to match
+_METRIC_PATTERNS = [
+    # Standard ML metrics
+    (('acc',), r'(?:^|\s)(accuracy|acc)[\s:=]+([0-9]*\.?[0-9]+)'),
+    (('prec',), r'(?:^|\s)(precision|prec)[\s:=]+([0-9]*\.?[0-9]+)'),
+    (('rec',), r'(?:^|\s)(recall|rec)[\s:=]+([0-9]*\.?[0-9]+)'),
+    (('f1',), r'(?:^|\s)(f1[\s_-]?score|f1)[\s:=]+([0-9]*\.?[0-9]+)'),
+    (('auc',), r'(?:^|\s)(auc|roc[\s_-]?auc)[\s:=]+([0-9]*\.?[0-9]+)'),
+    
+    # Loss metrics
+    (('loss',), r'(?:^|\s)(loss|train[\s_-]?loss|training[\s_-]?loss)[\s:=]+([0-9]*\.?[0-9]+)'),
+    (('loss',), r'(?:^|\s)(val[\s_-]?loss|validation[\s_-]?loss)[\s:=]+([0-9]*\.?[0-9]+)'),
+    (('loss',), r'(?:^|\s)(test[\s_-]?loss)[\s:=]+([0-9]*\.?[0-9]+)'),
+    
+    # Error metrics
+    (('mse', 'squared'), r'(?:^|\s)(mse|mean[\s_-]?squared[\s_-]?error)[\s:=]+([0-9]*\.?[0-9]+)'),
+    (('mae', 'absolute'), r'(?:^|\s)(mae|mean[\s_-]?absolute[\s_-]?error)[\s:=]+([0-9]*\.?[0-9]+)'),
+    (('rmse', 'squared'), r'(?:^|\s)(rmse|root[\s_-]?mean[\s_-]?squared[\s_-]?error)[\s:=]+([0-9]*\.?[0-9]+)'),
+    
+    # R-squared and correlation
+    (('r2', 'squared'), r'(?:^|\s)(r2|r[\s_-]?squared)[\s:=]+([0-9]*\.?[0-9]+)'),
+    (('corr',), r'(?:^|\s)(correlation|corr)[\s:=]+([0-9]*\.?[0-9]+)'),
+    
+    # Time metrics
+    (('epoch', 'step'), r'(?:^|\s)(epoch|step)[\s:=]+([0-9]+)'),
+    (('time', 'duration', 'elapsed'), r'(?:^|\s)(time|duration|elapsed)[\s:=]+([0-9]*\.?[0-9]+)'),
+]
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_metric_patterns(indices: Tuple[int, ...]) -> re.Pattern:
+    """Compile the selected metric patterns into one alternation so the text is scanned once."""
+    return re.compile(
+        '|'.join(f'(?:{_METRIC_PATTERNS[i][1]})' for i in indices),
+        re.IGNORECASE | re.MULTILINE
+    )
+
+# Custom metrics ("val_accuracy: 0.9", "test loss: 0.3") are found by scanning
+# for known metric keywords and widening each hit to the identifier around it,
+# instead of matching every "identifier: number" pair in the text.
+_METRIC_KEYWORDS = (
+    'accuracy', 'acc', 'precision', 'recall', 'f1', 'auc', 'score',
+    'loss', 'error', 'mse', 'mae', 'rmse', 'r2', 'corr',
+    'epoch', 'step', 'time', 'duration', 'elapsed',
+)
+_IDENTIFIER_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789_')
+_METRIC_VALUE_RE = re.compile(r'[\s:=]+([0-9]*\.?[0-9]+)(?:\s|$)', re.MULTILINE)
+
+if ahocorasick is not None:
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in _METRIC_KEYWORDS:
+        _KEYWORD_AUTOMATON.add_word(_keyword, len(_keyword))
+    _KEYWORD_AUTOMATON.make_automaton()
+else:
+    _KEYWORD_RE = re.compile('|'.join(sorted(_METRIC_KEYWORDS, key=len, reverse=True)))
+
+# sklearn classification report rows: "macro avg  0.80  0.70  0.75  20"
+# and "accuracy  0.75  20"
+_REPORT_AVG_RE = re.compile(
+    r'^\s*(macro|weighted|micro)\s+(avg)\s+([0-9]*\.?[0-9]+)\s+([0-9]*\.?[0-9]+)\s+([0-9]*\.?[0-9]+)',
+    re.IGNORECASE | re.MULTILINE
+)
+_REPORT_ACCURACY_RE = re.compile(r'^\s*accuracy\s+([0-9]*\.?[0-9]+)', re.IGNORECASE | re.MULTILINE)
+
+# Metric categories: exact names are a set lookup, anything else falls back to
+# keyword substrings. Training keywords take precedence (val_accuracy).
+_TRAINING_KEYWORDS = ('loss', 'train', 'val', 'validation', 'epoch', 'step')
+_PERFORMANCE_KEYWORDS = ('accuracy', 'precision', 'recall', 'f1', 'auc', 'mse', 'mae', 'rmse', 'r2')
+_TRAINING_METRIC_NAMES = frozenset({
+    'loss', 'train_loss', 'training_loss', 'val_loss', 'validation_loss', 'test_loss', 'epoch', 'step'
+})
+_PERFORMANCE_METRIC_NAMES = frozenset({
+    'accuracy', 'precision', 'recall', 'f1', 'f1_score', 'auc', 'roc_auc', 'mse', 'mae', 'rmse', 'r2'
+})
+
+# Outputs repeated across cells and notebooks (banners, version prints,
+# reprinted previews) are short; longer texts are not worth keeping cached.
+_CACHED_TEXT_MAX_LENGTH = 16 * 1024
+
+# Training log epochs: "Epoch 1/10 ... loss: 0.5 ... val_loss: 0.6", with the
+# metrics either on the "Epoch" line or on the line after it (Keras). Matches
+# never run past that next line.
+_EPOCH_RE = re.compile(
+    r'Epoch\s+(\d+)/(\d+)[^\n]*?(?:\n[^\n]*?)?loss:\s*([0-9]*\.?[0-9]+)'
+    r'(?:[^\n]*?val_loss:\s*([0-9]*\.?[0-9]+))?',
+    re.IGNORECASE
+)
+
+
+def load_notebook(notebook_path: Path) -> Dict[str, Any]:
+    """Load a notebook as plain JSON, without nbformat validation or node conversion."""
+    raw = Path(notebook_path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 def extract_metrics_from_notebook(notebook_path: Path) -> Dict[str, Any]:
     """
@@ -29,37 +156,40 @@ def extract_metrics_from_notebook(notebook_path: Path) -> Dict[str, Any]:
     }
     
     try:
-        with open(notebook_path, 'r', encoding='utf-8') as f:
-            nb = nbformat.read(f, as_version=4)
+        nb = load_notebook(notebook_path)
         
         # Extract notebook metadata
         metrics['execution_info'] = extract_execution_info(nb)
         
-        for cell_idx, cell in enumerate(nb.cells):
-            if cell.cell_type != 'code':
+        model_performance = {
+            'final_metrics': {},
+            'confusion_matrix': None,
+            'feature_importance': []
+        }
+        
+        # Single pass over the cells feeds metrics, training history and
+        # model performance
+        for cell_idx, cell in enumerate(nb.get('cells', [])):
+            if cell.get('cell_type') != 'code':
                 continue
             
-            cell_metrics = {}
+            texts = []
             
-            # Check cell outputs
+            # Collect cell text outputs
             for output in cell.get('outputs', []):
-                if output.get('output_type') == 'stream':
-                    text = ''.join(output.get('text', []))
-                    cell_metrics.update(extract_metrics_from_text(text))
+                output_type = output.get('output_type')
+                if output_type == 'stream':
+                    texts.append(_as_text(output.get('text', '')))
                 
-                elif output.get('output_type') == 'execute_result':
-                    data = output.get('data', {})
-                    if 'text/plain' in data:
-                        text = ''.join(data['text/plain'])
-                        cell_metrics.update(extract_metrics_from_text(text))
-                
-                elif output.get('output_type') == 'display_data':
+                elif output_type in ('execute_result', 'display_data'):
                     data = output.get('data', {})
+                    # Plots only carry a "<Figure ...>" repr next to the image
+                    if output_type == 'display_data' and any(key.startswith('image/') for key in data):
+                        continue
                     if 'text/plain' in data:
-                        text = ''.join(data['text/plain'])
-                        cell_metrics.update(extract_metrics_from_text(text))
+                        texts.append(_as_text(data['text/plain']))
                 
-                elif output.get('output_type') == 'error':
+                elif output_type == 'error':
                     error_info = {
                         'cell': cell_idx,
                         'error_name': output.get('ename', 'Unknown'),
@@ -68,6 +198,19 @@ def extract_metrics_from_notebook(notebook_path: Path) -> Dict[str, Any]:
                     }
                     metrics['errors'].append(error_info)
             
+            if not texts:
+                continue
+            
+            # Scan all of the cell's text once and share the result between
+            # metrics, training history and final test results
+            text = '\n'.join(texts)
+            low = text.lower()
+            cell_metrics = extract_metrics_from_text(text)
+            
+            if 'epoch' in low:
+                metrics['training_history'].extend(extract_epoch_history(text, cell_idx))
+            model_performance['final_metrics'].update(extract_test_metrics(low, cell_metrics))
+            
             # If we found metrics in this cell, store them
             if cell_metrics:
                 metrics['extracted_metrics'][f'cell_{cell_idx}'] = cell_metrics
@@ -75,11 +218,7 @@ def extract_metrics_from_notebook(notebook_path: Path) -> Dict[str, Any]:
                 # Categorize metrics
                 categorize_metrics(cell_metrics, metrics)
         
-        # Extract training history patterns
-        metrics['training_history'] = extract_training_history(nb)
-        
-        # Extract model evaluation results
-        metrics['model_performance'] = extract_model_performance(nb)
+        metrics['model_performance'] = model_performance
         
     except Exception as e:
         metrics['errors'].append({
@@ -90,86 +229,87 @@ def extract_metrics_from_notebook(notebook_path: Path) -> Dict[str, Any]:
     return metrics
 
 
-def extract_execution_info(nb: nbformat.NotebookNode) -> Dict[str, Any]:
+def _as_text(value: Any) -> str:
+    """Return notebook multiline text, which is stored as a string or a list of lines."""
+    return value if isinstance(value, str) else ''.join(value)
+
+
+def extract_execution_info(nb: Dict[str, Any]) -> Dict[str, Any]:
     """Extract notebook execution information."""
+    cells = nb.get('cells', [])
+    metadata = nb.get('metadata', {})
+    code_cells = markdown_cells = executed_cells = 0
+    execution_times = []
+    
+    for cell in cells:
+        cell_type = cell.get('cell_type')
+        if cell_type == 'markdown':
+            markdown_cells += 1
+            continue
+        if cell_type != 'code':
+            continue
+        
+        code_cells += 1
+        if not cell.get('execution_count'):
+            continue
+        executed_cells += 1
+        
+        # Extract execution timing if available
+        exec_data = cell.get('metadata', {}).get('execution', {})
+        if 'iopub.execute_input' in exec_data and 'iopub.status.idle' in exec_data:
+            try:
+                start_time = parse_timestamp(exec_data['iopub.execute_input'])
+                end_time = parse_timestamp(exec_data['iopub.status.idle'])
+                execution_times.append((end_time - start_time).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    
     info = {
-        'kernel_spec': nb.metadata.get('kernelspec', {}),
-        'language_info': nb.metadata.get('language_info', {}),
-        'total_cells': len(nb.cells),
-        'code_cells': sum(1 for cell in nb.cells if cell.cell_type == 'code'),
-        'markdown_cells': sum(1 for cell in nb.cells if cell.cell_type == 'markdown'),
-        'executed_cells': 0,
-        'execution_times': []
+        'kernel_spec': metadata.get('kernelspec', {}),
+        'language_info': metadata.get('language_info', {}),
+        'total_cells': len(cells),
+        'code_cells': code_cells,
+        'markdown_cells': markdown_cells,
+        'executed_cells': executed_cells,
+        'execution_times': execution_times
     }
     
-    for cell in nb.cells:
-        if cell.cell_type == 'code' and cell.get('execution_count'):
-            info['executed_cells'] += 1
-            
-            # Extract execution timing if available
-            metadata = cell.get('metadata', {})
-            if 'execution' in metadata:
-                exec_data = metadata['execution']
-                if 'iopub.execute_input' in exec_data and 'iopub.status.idle' in exec_data:
-                    try:
-                        start_time = datetime.fromisoformat(exec_data['iopub.execute_input'].replace('Z', '+00:00'))
-                        end_time = datetime.fromisoformat(exec_data['iopub.status.idle'].replace('Z', '+00:00'))
-                        duration = (end_time - start_time).total_seconds()
-                        info['execution_times'].append(duration)
-                    except:
-                        pass
-    
-    if info['execution_times']:
-        info['avg_execution_time'] = sum(info['execution_times']) / len(info['execution_times'])
-        info['total_execution_time'] = sum(info['execution_times'])
+    if execution_times:
+        total, mean, _, _ = summarize_values(execution_times)
+        info['avg_execution_time'] = mean
+        info['total_execution_time'] = total
     
     return info
 
 
 def extract_metrics_from_text(text: str) -> Dict[str, float]:
-    """Extract numeric metrics from text output."""
+    """Extract numeric metrics from text output, reusing results for repeated short texts."""
+    if len(text) > _CACHED_TEXT_MAX_LENGTH:
+        return _extract_metrics_from_text(text)
+    return dict(_extract_metrics_cached(text))
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_metrics_cached(text: str) -> Tuple[Tuple[str, float], ...]:
+    return tuple(_extract_metrics_from_text(text).items())
+
+
+def _extract_metrics_from_text(text: str) -> Dict[str, float]:
     metrics = {}
+    low = text.lower()
     
-    # Common metric patterns
-    metric_patterns = [
-        # Standard ML metrics
-        r'(?:^|\s)(accuracy|acc)[\s:=]+([0-9]*\.?[0-9]+)',
-        r'(?:^|\s)(precision|prec)[\s:=]+([0-9]*\.?[0-9]+)',
-        r'(?:^|\s)(recall|rec)[\s:=]+([0-9]*\.?[0-9]+)',
-        r'(?:^|\s)(f1[\s_-]?score|f1)[\s:=]+([0-9]*\.?[0-9]+)',
-        r'(?:^|\s)(auc|roc[\s_-]?auc)[\s:=]+([0-9]*\.?[0-9]+)',
-        
-        # Loss metrics
-        r'(?:^|\s)(loss|train[\s_-]?loss|training[\s_-]?loss)[\s:=]+([0-9]*\.?[0-9]+)',
-        r'(?:^|\s)(val[\s_-]?loss|validation[\s_-]?loss)[\s:=]+([0-9]*\.?[0-9]+)',
-        r'(?:^|\s)(test[\s_-]?loss)[\s:=]+([0-9]*\.?[0-9]+)',
-        
-        # Error metrics
-        r'(?:^|\s)(mse|mean[\s_-]?squared[\s_-]?error)[\s:=]+([0-9]*\.?[0-9]+)',
-        r'(?:^|\s)(mae|mean[\s_-]?absolute[\s_-]?error)[\s:=]+([0-9]*\.?[0-9]+)',
-        r'(?:^|\s)(rmse|root[\s_-]?mean[\s_-]?squared[\s_-]?error)[\s:=]+([0-9]*\.?[0-9]+)',
-        
-        # R-squared and correlation
-        r'(?:^|\s)(r2|r[\s_-]?squared)[\s:=]+([0-9]*\.?[0-9]+)',
-        r'(?:^|\s)(correlation|corr)[\s:=]+([0-9]*\.?[0-9]+)',
-        
-        # Time metrics
-        r'(?:^|\s)(epoch|step)[\s:=]+([0-9]+)',
-        r'(?:^|\s)(time|duration|elapsed)[\s:=]+([0-9]*\.?[0-9]+)',
-        
-        # Custom metric pattern: "metric_name: value"
-        r'([a-zA-Z_][a-zA-Z0-9_]*)[\s:=]+([0-9]*\.?[0-9]+)(?:\s|$)',
-    ]
-    
-    for pattern in metric_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-        for match in matches:
-            metric_name = match[0].lower().replace(' ', '_').replace('-', '_')
-            try:
-                metric_value = float(match[1])
-                metrics[metric_name] = metric_value
-            except ValueError:
-                continue
+    # Only run the patterns whose keywords actually occur in the text
+    indices = tuple(
+        i for i, (keywords, _) in enumerate(_METRIC_PATTERNS)
+        if any(keyword in low for keyword in keywords)
+    )
+    if indices:
+        # Each alternative captures a (name, value) pair as its last two groups
+        for match in _compile_metric_patterns(indices).finditer(text):
+            name, value = match.group(match.lastindex - 1, match.lastindex)
+            metrics[name.lower().replace(' ', '_').replace('-', '_')] = float(value)
+    
+    metrics.update(extract_keyword_metrics(low))
     
     # Extract metrics from sklearn classification reports
     classification_metrics = extract_classification_report_metrics(text)
@@ -182,36 +322,57 @@ def extract_metrics_from_text(text: str) -> Dict[str, float]:
     return metrics
 
 
+def _iter_keyword_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) spans of metric keywords in lowercase text."""
+    if ahocorasick is not None:
+        for end_index, length in _KEYWORD_AUTOMATON.iter(text):
+            yield end_index + 1 - length, end_index + 1
+    else:
+        for match in _KEYWORD_RE.finditer(text):
+            yield match.span()
+
+
+def extract_keyword_metrics(low: str) -> Dict[str, float]:
+    """Extract "identifier: value" pairs whose identifier contains a metric keyword from lowercase text."""
+    metrics = {}
+    length = len(low)
+    scanned = 0
+    
+    for start, end in _iter_keyword_spans(low):
+        if end <= scanned:
+            continue  # Inside an identifier that was already handled
+        
+        while start > 0 and low[start - 1] in _IDENTIFIER_CHARS:
+            start -= 1
+        while end < length and low[end] in _IDENTIFIER_CHARS:
+            end += 1
+        scanned = end
+        
+        match = _METRIC_VALUE_RE.match(low, end)
+        if match:
+            name = low[start:end].lstrip('0123456789')
+            metrics[name] = float(match.group(1))
+    
+    return metrics
+
+
 def extract_classification_report_metrics(text: str) -> Dict[str, float]:
     """Extract metrics from sklearn classification report."""
     metrics = {}
     
-    # Look for classification report pattern
-    if 'precision' in text.lower() and 'recall' in text.lower() and 'f1-score' in text.lower():
-        lines = text.split('\n')
-        for line in lines:
-            # Look for overall metrics (macro avg, weighted avg, etc.)
-            if any(keyword in line.lower() for keyword in ['macro avg', 'weighted avg', 'micro avg']):
-                parts = line.split()
-                if len(parts) >= 5:
-                    avg_type = parts[0] + '_' + parts[1]
-                    try:
-                        metrics[f'{avg_type}_precision'] = float(parts[2])
-                        metrics[f'{avg_type}_recall'] = float(parts[3])
-                        metrics[f'{avg_type}_f1_score'] = float(parts[4])
-                    except (ValueError, IndexError):
-                        continue
-            
-            # Look for accuracy
-            elif 'accuracy' in line.lower():
-                parts = line.split()
-                for i, part in enumerate(parts):
-                    try:
-                        if 'accuracy' in part.lower() and i + 1 < len(parts):
-                            metrics['accuracy'] = float(parts[i + 1])
-                            break
-                    except ValueError:
-                        continue
+    # Look for classification report pattern, rarest token first
+    low = text.lower()
+    if 'f1-score' in low and 'precision' in low and 'recall' in low:
+        # Overall metrics (macro avg, weighted avg, etc.)
+        for match in _REPORT_AVG_RE.finditer(text):
+            avg_type = f'{match.group(1)}_{match.group(2)}'
+            metrics[f'{avg_type}_precision'] = float(match.group(3))
+            metrics[f'{avg_type}_recall'] = float(match.group(4))
+            metrics[f'{avg_type}_f1_score'] = float(match.group(5))
+        
+        accuracy_values = _REPORT_ACCURACY_RE.findall(text)
+        if accuracy_values:
+            metrics['accuracy'] = float(accuracy_values[-1])
     
     return metrics
 
@@ -220,7 +381,8 @@ def extract_describe_metrics(text: str) -> Dict[str, float]:
     """Extract metrics from pandas DataFrame.describe() output."""
     metrics = {}
     
-    if 'count' in text.lower() and 'mean' in text.lower() and 'std' in text.lower():
+    low = text.lower()
+    if 'std' in low and 'count' in low and 'mean' in low:
         lines = text.split('\n')
         for line in lines:
             line = line.strip()
@@ -240,90 +402,60 @@ def extract_describe_metrics(text: str) -> Dict[str, float]:
 def categorize_metrics(cell_metrics: Dict[str, float], overall_metrics: Dict[str, Any]) -> None:
     """Categorize metrics into training history and model performance."""
     
-    training_keywords = ['loss', 'train', 'val', 'validation', 'epoch', 'step']
-    performance_keywords = ['accuracy', 'precision', 'recall', 'f1', 'auc', 'mse', 'mae', 'rmse', 'r2']
-    
     for metric_name, metric_value in cell_metrics.items():
+        name = metric_name.lower()
+        
+        # Exact names first, keyword substrings only for the rest
+        is_training = name in _TRAINING_METRIC_NAMES or (
+            name not in _PERFORMANCE_METRIC_NAMES
+            and any(keyword in name for keyword in _TRAINING_KEYWORDS)
+        )
+        
         # Check if it's a training metric
-        if any(keyword in metric_name.lower() for keyword in training_keywords):
+        if is_training:
             if 'training_metrics' not in overall_metrics:
                 overall_metrics['training_metrics'] = {}
             overall_metrics['training_metrics'][metric_name] = metric_value
         
         # Check if it's a performance metric
-        elif any(keyword in metric_name.lower() for keyword in performance_keywords):
+        elif name in _PERFORMANCE_METRIC_NAMES or any(keyword in name for keyword in _PERFORMANCE_KEYWORDS):
             overall_metrics['model_performance'][metric_name] = metric_value
 
 
-def extract_training_history(nb: nbformat.NotebookNode) -> List[Dict[str, Any]]:
-    """Extract training history from notebook outputs."""
+def extract_epoch_history(text: str, cell_idx: int) -> List[Dict[str, Any]]:
+    """Extract epoch-based training history from a cell output."""
     training_history = []
     
-    for cell_idx, cell in enumerate(nb.cells):
-        if cell.cell_type != 'code':
-            continue
+    for match in _EPOCH_RE.findall(text):
+        epoch_data = {
+            'cell': cell_idx,
+            'epoch': int(match[0]),
+            'total_epochs': int(match[1]),
+            'loss': float(match[2])
+        }
+        if match[3]:  # val_loss exists
+            epoch_data['val_loss'] = float(match[3])
         
-        for output in cell.get('outputs', []):
-            text = ""
-            if output.get('output_type') == 'stream':
-                text = ''.join(output.get('text', []))
-            elif output.get('output_type') in ['execute_result', 'display_data']:
-                data = output.get('data', {})
-                if 'text/plain' in data:
-                    text = ''.join(data['text/plain'])
-            
-            # Look for epoch-based training logs
-            epoch_pattern = r'Epoch\s+(\d+)/(\d+).*?loss:\s*([0-9]*\.?[0-9]+).*?(?:val_loss:\s*([0-9]*\.?[0-9]+))?'
-            matches = re.findall(epoch_pattern, text, re.IGNORECASE | re.DOTALL)
-            
-            for match in matches:
-                epoch_data = {
-                    'cell': cell_idx,
-                    'epoch': int(match[0]),
-                    'total_epochs': int(match[1]),
-                    'loss': float(match[2])
-                }
-                if match[3]:  # val_loss exists
-                    epoch_data['val_loss'] = float(match[3])
-                
-                training_history.append(epoch_data)
+        training_history.append(epoch_data)
     
     return training_history
 
 
-def extract_model_performance(nb: nbformat.NotebookNode) -> Dict[str, Any]:
-    """Extract final model performance metrics."""
-    performance = {
-        'final_metrics': {},
-        'confusion_matrix': None,
-        'feature_importance': []
-    }
+def extract_test_metrics(low: str, text_metrics: Dict[str, float]) -> Dict[str, float]:
+    """Select final test-set metrics from those extracted from a lowercase cell output."""
+    final_metrics = {}
     
-    for cell in nb.cells:
-        if cell.cell_type != 'code':
-            continue
-        
-        for output in cell.get('outputs', []):
-            text = ""
-            if output.get('output_type') == 'stream':
-                text = ''.join(output.get('text', []))
-            elif output.get('output_type') in ['execute_result', 'display_data']:
-                data = output.get('data', {})
-                if 'text/plain' in data:
-                    text = ''.join(data['text/plain'])
-            
-            # Look for final test results
-            if 'test' in text.lower() and any(metric in text.lower() for metric in ['accuracy', 'precision', 'recall', 'f1']):
-                test_metrics = extract_metrics_from_text(text)
-                for key, value in test_metrics.items():
-                    if 'test' in key or any(metric in key for metric in ['accuracy', 'precision', 'recall', 'f1']):
-                        performance['final_metrics'][key] = value
+    if 'test' in low and any(metric in low for metric in ['accuracy', 'precision', 'recall', 'f1']):
+        for key, value in text_metrics.items():
+            if 'test' in key or any(metric in key for metric in ['accuracy', 'precision', 'recall', 'f1']):
+                final_metrics[key] = value
     
-    return performance
+    return final_metrics
 
 
-def analyze_notebook_directory(directory_path: Path) -> Dict[str, Any]:
-    """Analyze all notebooks in a directory."""
+def analyze_notebook_directory(directory_path: Path, max_workers: Optional[int] = None,
+                               keep_raw_values: bool = False) -> Dict[str, Any]:
+    """Analyze all notebooks in a directory, one worker process per CPU by default."""
     results = {
         'directory': str(directory_path),
         'notebooks': {},
@@ -336,36 +468,98 @@ def analyze_notebook_directory(directory_path: Path) -> Dict[str, Any]:
         'aggregated_metrics': {}
     }
     
-    notebook_files = list(directory_path.rglob("*.ipynb"))
-    results['summary']['total_notebooks'] = len(notebook_files)
+    # Running statistics per metric, updated as each notebook result arrives
+    metric_stats = {}
     
-    all_metrics = []
+    # Notebooks are handed to the workers while the directory walk is still
+    # running instead of collecting the full file list first
+    notebook_files = directory_path.rglob("*.ipynb")
     
-    for notebook_path in notebook_files:
-        print(f"Analyzing {notebook_path.name}...")
-        
-        notebook_metrics = extract_metrics_from_notebook(notebook_path)
-        notebook_name = notebook_path.relative_to(directory_path)
-        results['notebooks'][str(notebook_name)] = notebook_metrics
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        analyzed = executor.map(extract_metrics_from_notebook, notebook_files, chunksize=8)
         
-        if notebook_metrics['errors']:
-            results['summary']['with_errors'] += 1
-        else:
-            results['summary']['successfully_analyzed'] += 1
-        
-        if notebook_metrics['extracted_metrics']:
-            results['summary']['with_metrics'] += 1
-            all_metrics.append(notebook_metrics)
+        for notebook_metrics in analyzed:
+            notebook_path = Path(notebook_metrics['file'])
+            print(f"Analyzed {notebook_path.name}")
+            results['summary']['total_notebooks'] += 1
+            
+            notebook_name = notebook_path.relative_to(directory_path)
+            results['notebooks'][str(notebook_name)] = notebook_metrics
+            
+            if notebook_metrics['errors']:
+                results['summary']['with_errors'] += 1
+            else:
+                results['summary']['successfully_analyzed'] += 1
+            
+            if notebook_metrics['extracted_metrics']:
+                results['summary']['with_metrics'] += 1
+                update_metric_stats(metric_stats, notebook_metrics, keep_raw_values)
     
     # Aggregate metrics across all notebooks
-    if all_metrics:
-        results['aggregated_metrics'] = aggregate_metrics(all_metrics)
+    if metric_stats:
+        results['aggregated_metrics'] = summarize_metric_stats(metric_stats)
     
     return results
 
 
-def aggregate_metrics(notebook_metrics_list: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Aggregate metrics across multiple notebooks."""
+def summarize_values(values: List[float]) -> Tuple[float, float, float, float]:
+    """Return (total, mean, min, max) of a non-empty list of values."""
+    if np is not None:
+        arr = np.fromiter(values, dtype=np.float64, count=len(values))
+        total = float(arr.sum())
+        return total, total / arr.size, float(arr.min()), float(arr.max())
+    
+    total = sum(values)
+    return total, total / len(values), min(values), max(values)
+
+
+def quartiles(values: List[float]) -> List[float]:
+    """Return the 0, 25, 50, 75 and 100th percentiles of at least two values."""
+    if np is not None:
+        return np.quantile(np.asarray(values, dtype=np.float64), [0.0, 0.25, 0.5, 0.75, 1.0]).tolist()
+    
+    # The 'inclusive' method matches NumPy's default linear interpolation
+    return [min(values), *statistics.quantiles(values, n=4, method='inclusive'), max(values)]
+
+
+@dataclass
+class RunningStats:
+    """Count, mean, min and max of a metric, updated one value at a time."""
+    count: int = 0
+    mean: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+    values: Optional[List[float]] = None  # Raw values, only when they are kept
+    
+    def update(self, value: float) -> None:
+        self.count += 1
+        self.mean += (value - self.mean) / self.count  # Welford mean update
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if self.values is not None:
+            self.values.append(value)
+
+
+def update_metric_stats(metric_stats: Dict[str, RunningStats], nb_metrics: Dict[str, Any],
+                        keep_raw_values: bool = False) -> None:
+    """Fold one notebook's extracted metrics into the running statistics."""
+    for cell_metrics in nb_metrics['extracted_metrics'].values():
+        for metric_name, value in cell_metrics.items():
+            stats = metric_stats.get(metric_name)
+            if stats is None:
+                stats = metric_stats[metric_name] = RunningStats(values=[] if keep_raw_values else None)
+            stats.update(value)
+
+
+def summarize_metric_stats(metric_stats: Dict[str, RunningStats]) -> Dict[str, Any]:
+    """
+    Build the aggregated metrics report from running statistics.
+    
+    Each common metric is summarized by its count, mean and range; quartiles
+    and the raw values are included only when the values were kept.
+    """
     aggregated = {
         'common_metrics': {},
         'best_performance': {},
@@ -376,42 +570,49 @@ def aggregate_metrics(notebook_metrics_list: List[Dict[str, Any]]) -> Dict[str,
         }
     }
     
-    # Collect all metric names
-    all_metric_names = set()
-    metric_values = {}
-    
-    for nb_metrics in notebook_metrics_list:
-        for cell_metrics in nb_metrics['extracted_metrics'].values():
-            for metric_name, value in cell_metrics.items():
-                all_metric_names.add(metric_name)
-                if metric_name not in metric_values:
-                    metric_values[metric_name] = []
-                metric_values[metric_name].append(value)
-    
     # Calculate statistics for common metrics
-    for metric_name, values in metric_values.items():
-        if len(values) > 1:  # Only include metrics that appear in multiple places
-            aggregated['common_metrics'][metric_name] = {
-                'count': len(values),
-                'mean': sum(values) / len(values),
-                'min': min(values),
-                'max': max(values),
-                'values': values
+    for metric_name, stats in metric_stats.items():
+        if stats.count > 1:  # Only include metrics that appear in multiple places
+            summary = {
+                'count': stats.count,
+                'mean': stats.mean,
+                'min': stats.min,
+                'max': stats.max
             }
+            if stats.values is not None:
+                summary['quantiles'] = quartiles(stats.values)
+                summary['values'] = stats.values
+            aggregated['common_metrics'][metric_name] = summary
             
             # Track best performance
             if any(perf_keyword in metric_name.lower() for perf_keyword in ['accuracy', 'f1', 'auc', 'r2']):
-                aggregated['best_performance'][metric_name] = max(values)
+                aggregated['best_performance'][metric_name] = stats.max
             elif any(loss_keyword in metric_name.lower() for loss_keyword in ['loss', 'error', 'mse', 'mae']):
-                aggregated['best_performance'][metric_name] = min(values)
+                aggregated['best_performance'][metric_name] = stats.min
     
     return aggregated
 
 
+def aggregate_metrics(notebook_metrics_list: List[Dict[str, Any]], keep_raw_values: bool = False) -> Dict[str, Any]:
+    """Aggregate metrics across multiple notebooks."""
+    metric_stats = {}
+    for nb_metrics in notebook_metrics_list:
+        update_metric_stats(metric_stats, nb_metrics, keep_raw_values)
+    return summarize_metric_stats(metric_stats)
+
+
+def dump_json(results: Dict[str, Any]) -> str:
+    """Serialize results as indented JSON, using orjson when available."""
+    if orjson is not None:
+        options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        return orjson.dumps(results, option=options).decode()
+    return json.dumps(results, indent=2)
+
+
 def generate_report(results: Dict[str, Any], output_format: str = 'json') -> str:
     """Generate a formatted report."""
     if output_format == 'json':
-        return json.dumps(results, indent=2)
+        return dump_json(results)
     
     elif output_format == 'summary':
         report_lines = []
@@ -447,6 +648,8 @@ def main():
     parser.add_argument('-f', '--format', choices=['json', 'summary'], default='summary',
                        help='Output format (default: summary)')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
+    parser.add_argument('--keep-raw-values', action='store_true',
+                       help='Keep every raw value of common metrics and report them with their quartiles')
     
     args = parser.parse_args()
     
@@ -469,13 +672,13 @@ def main():
                         print(f"  {cell}: {metrics}")
                 if results['errors']:
                     print(f"Errors found: {len(results['errors'])}")
-                output_text = json.dumps(results, indent=2) if args.verbose else "Use -v for full output"
+                output_text = dump_json(results) if args.verbose else "Use -v for full output"
             else:
                 output_text = generate_report(results, args.format)
         
         elif path.is_dir():
             # Directory analysis
-            results = analyze_notebook_directory(path)
+            results = analyze_notebook_directory(path, keep_raw_values=args.keep_raw_values)
             output_text = generate_report(results, args.format)
         
         else:
@@ -8,9 +8,22 @@ Compatible with CI/CD workflows that process files one at a time.
 import argparse
 import json
 import sys
-import re
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator
+
+from cpp_scan import read_source, scan
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Files smaller than this skip the ratio checks (complexity per function,
+# comment ratio), which say nothing meaningful about a few lines; the
+# pattern checks still run, so a small header cannot hide a real problem
+_TRIVIAL_FILE_BYTES = 512
 
 
 class CppFileAnalyzer:
@@ -28,20 +41,24 @@ class CppFileAnalyzer:
     def analyze(self) -> Dict:
         """Run all analysis checks on the C++ file."""
         try:
-            with open(self.filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            content = read_source(self.filepath)
             
-            lines = content.split('\n')
+            findings = scan(content)
+            trivial = len(content) < _TRIVIAL_FILE_BYTES
             
             # Run all checks
-            self._check_complexity(content)
-            self._check_code_metrics(lines)
-            self._check_best_practices(content)
-            self._check_performance(content)
-            self._check_modern_cpp(content)
-            self._check_memory_safety(content)
+            if not trivial:
+                self._check_complexity(findings)
+                self._check_code_metrics(findings)
+            self._check_best_practices(findings)
+            self._check_performance(findings)
+            self._check_modern_cpp(findings)
+            self._check_memory_safety(findings)
             
-            return self._generate_report()
+            report = self._generate_report()
+            if trivial:
+                report['note'] = 'ratio checks skipped: trivial file'
+            return report
             
         except Exception as e:
             return {
@@ -50,22 +67,10 @@ class CppFileAnalyzer:
                 'score': 0
             }
     
-    def _check_complexity(self, content: str):
+    def _check_complexity(self, findings: Dict):
         """Analyze cyclomatic complexity."""
-        # Count decision points
-        decision_points = (
-            content.count('if') +
-            content.count('for') +
-            content.count('while') +
-            content.count('case') +
-            content.count('&&') +
-            content.count('||') +
-            content.count('?')
-        )
-        
-        # Count functions
-        function_matches = re.findall(r'\w+\s+\w+\s*\([^)]*\)\s*(?:const\s*)?{', content)
-        num_functions = len(function_matches)
+        num_functions = findings['functions']
+        decision_points = findings['decision_points']
         
         if num_functions > 0:
             avg_complexity = decision_points / num_functions
@@ -89,29 +94,11 @@ class CppFileAnalyzer:
                     'suggestion': 'Consider refactoring complex functions'
                 })
     
-    def _check_code_metrics(self, lines: List[str]):
+    def _check_code_metrics(self, findings: Dict):
         """Check documentation and comment ratios."""
-        total_lines = len(lines)
-        comment_lines = 0
-        blank_lines = 0
-        in_multiline_comment = False
-        
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                blank_lines += 1
-            elif stripped.startswith('//'):
-                comment_lines += 1
-            elif '/*' in stripped and '*/' in stripped:
-                comment_lines += 1
-            elif '/*' in stripped:
-                comment_lines += 1
-                in_multiline_comment = True
-            elif '*/' in stripped:
-                comment_lines += 1
-                in_multiline_comment = False
-            elif in_multiline_comment:
-                comment_lines += 1
+        total_lines = findings['total_lines']
+        comment_lines = findings['comment_lines']
+        blank_lines = findings['blank_lines']
         
         code_lines = total_lines - comment_lines - blank_lines
         
@@ -135,10 +122,10 @@ class CppFileAnalyzer:
                     'message': f'Comment ratio {comment_ratio:.1%} could be improved'
                 })
     
-    def _check_best_practices(self, content: str):
+    def _check_best_practices(self, findings: Dict):
         """Check C++ best practices."""
         # Raw pointers with new
-        if re.search(r'\bnew\s+\w+', content):
+        if findings['raw_new']:
             self.score -= 10
             self.warnings.append({
                 'type': 'RAW_NEW',
@@ -149,7 +136,7 @@ class CppFileAnalyzer:
             })
         
         # Manual delete
-        if re.search(r'\bdelete\b', content):
+        if findings['manual_delete']:
             self.score -= 10
             self.warnings.append({
                 'type': 'MANUAL_DELETE',
@@ -160,18 +147,18 @@ class CppFileAnalyzer:
             })
         
         # C-style casts
-        c_cast_matches = re.findall(r'\([a-zA-Z_]\w*\s*\*?\s*\)\s*[a-zA-Z_]', content)
-        if c_cast_matches:
+        c_cast_count = findings['c_casts']
+        if c_cast_count:
             self.score -= 8
             self.info.append({
                 'type': 'C_STYLE_CAST',
                 'severity': 'low',
-                'message': f'C-style cast(s) found: {len(c_cast_matches)} occurrence(s)',
+                'message': f'C-style cast(s) found: {c_cast_count} occurrence(s)',
                 'suggestion': 'Use static_cast, dynamic_cast, const_cast, or reinterpret_cast'
             })
         
         # using namespace std in headers
-        if self.is_header and 'using namespace std' in content:
+        if self.is_header and findings['using_namespace_std']:
             self.score -= 20
             self.issues.append({
                 'type': 'USING_NAMESPACE_HEADER',
@@ -182,11 +169,7 @@ class CppFileAnalyzer:
             })
         
         # Missing virtual destructor
-        has_virtual = 'virtual' in content
-        has_virtual_destructor = re.search(r'virtual\s+~\w+', content)
-        class_definitions = re.findall(r'class\s+\w+', content)
-        
-        if has_virtual and not has_virtual_destructor and class_definitions:
+        if findings['missing_virtual_destructor']:
             self.score -= 15
             self.warnings.append({
                 'type': 'MISSING_VIRTUAL_DESTRUCTOR',
@@ -195,26 +178,72 @@ class CppFileAnalyzer:
                 'penalty': -15,
                 'suggestion': 'Add virtual destructor to base classes with virtual methods'
             })
+    
+    def _check_performance(self, findings: Dict):
+        """Check for common C++ performance pitfalls."""
+        # Pass-by-value of large objects
+        if findings['vector_by_value']:
+            self.score -= 5
+            self.warnings.append({
+                'type': 'VECTOR_BY_VALUE',
+                'severity': 'medium',
+                'message': 'Potential pass-by-value of vector',
+                'penalty': -5,
+                'suggestion': 'Pass containers by const reference'
+            })
         
+        # String concatenation in loops
+        if findings['string_concat_in_loop']:
+            self.score -= 5
+            self.warnings.append({
+                'type': 'STRING_CONCAT_IN_LOOP',
+                'severity': 'medium',
+                'message': 'String concatenation in loop',
+                'penalty': -5,
+                'suggestion': 'Use std::ostringstream or reserve() the string first'
+            })
+        
+        # Unnecessary copies
+        if findings['auto_copy']:
+            self.info.append({
+                'type': 'AUTO_COPY',
+                'severity': 'low',
+                'message': 'Potential unnecessary copy with auto',
+                'suggestion': 'Use auto& or const auto& to avoid the copy'
+            })
+    
+    def _check_modern_cpp(self, findings: Dict):
+        """Check for pre-C++11 idioms with modern replacements."""
         # NULL instead of nullptr
-        if re.search(r'\bNULL\b', content):
+        if findings['null_macro']:
             self.score -= 5
             self.info.append({
                 'type': 'NULL_MACRO',
                 'severity': 'low',
                 'message': 'Using NULL macro',
-	        'suggestion': 'Consider using vector::at() for bounds checking'
+                'suggestion': 'Use nullptr instead of NULL'
             })
-        
+    
+    def _check_memory_safety(self, findings: Dict):
+        """Check for patterns that risk invalid memory access."""
         # Uninitialized pointers
-        pointer_declarations = re.findall(r'\b\w+\s*\*\s*\w+\s*;', content)
-        if pointer_declarations:
+        pointer_count = findings['pointer_declarations']
+        if pointer_count:
             self.warnings.append({
                 'type': 'POINTER_DECLARATION',
                 'severity': 'medium',
-                'message': f'{len(pointer_declarations)} pointer declaration(s) found',
+                'message': f'{pointer_count} pointer declaration(s) found',
                 'suggestion': 'Initialize pointers (nullptr) or use smart pointers'
             })
+        
+        # Unchecked vector indexing
+        if findings['vector_index_loop']:
+            self.info.append({
+                'type': 'VECTOR_INDEXING',
+                'severity': 'low',
+                'message': 'Vector indexed with [] without bounds checks',
+                'suggestion': 'Consider using vector::at() for bounds checking'
+            })
     
     def _generate_report(self) -> Dict:
         """Generate the analysis report."""
@@ -231,6 +260,10 @@ class CppFileAnalyzer:
         else:
             grade = 'F'
         
+        # One pass per list instead of one comprehension per severity
+        issue_counts = Counter(i.get('severity') for i in self.issues)
+        warning_counts = Counter(i.get('severity') for i in self.warnings)
+        
         return {
             'filepath': str(self.filepath),
             'filename': self.filename,
@@ -241,69 +274,81 @@ class CppFileAnalyzer:
             'warnings': self.warnings,
             'info': self.info,
             'summary': {
-                'critical_issues': len([i for i in self.issues if i.get('severity') == 'critical']),
-                'high_issues': len([i for i in self.issues if i.get('severity') == 'high']),
-                'medium_issues': len([i for i in self.warnings if i.get('severity') == 'medium']),
+                'critical_issues': issue_counts['critical'],
+                'high_issues': issue_counts['high'],
+                'medium_issues': warning_counts['medium'],
                 'low_issues': len(self.info),
             }
         }
 
 
-def format_text_report(report: Dict) -> str:
-    """Format the report as human-readable text."""
-    output = []
-    output.append("=" * 70)
-    output.append("C++ QUALITY ANALYSIS REPORT")
-    output.append("=" * 70)
-    output.append(f"File: {report['filename']} ({report['file_type']})")
-    output.append(f"Score: {report['overall_score']}/100 (Grade: {report['grade']})")
-    output.append("-" * 70)
+def dump_json(report: Dict) -> bytes:
+    """Serialize a report as indented JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2)
+    return json.dumps(report, indent=2).encode()
+
+
+def _iter_text_report(report: Dict) -> Iterator[str]:
+    """Yield the human-readable report one newline-terminated line at a time."""
+    yield "=" * 70 + "\n"
+    yield "C++ QUALITY ANALYSIS REPORT\n"
+    yield "=" * 70 + "\n"
+    yield f"File: {report['filename']} ({report['file_type']})\n"
+    yield f"Score: {report['overall_score']}/100 (Grade: {report['grade']})\n"
+    if 'note' in report:
+        yield f"Note: {report['note']}\n"
+    yield "-" * 70 + "\n"
     
     summary = report['summary']
-    output.append("Summary:")
-    output.append(f"  Critical Issues: {summary['critical_issues']}")
-    output.append(f"  High Issues: {summary['high_issues']}")
-    output.append(f"  Medium Issues: {summary['medium_issues']}")
-    output.append(f"  Low Issues: {summary['low_issues']}")
-    output.append("-" * 70)
+    yield "Summary:\n"
+    yield f"  Critical Issues: {summary['critical_issues']}\n"
+    yield f"  High Issues: {summary['high_issues']}\n"
+    yield f"  Medium Issues: {summary['medium_issues']}\n"
+    yield f"  Low Issues: {summary['low_issues']}\n"
+    yield "-" * 70 + "\n"
     
     if report['issues']:
-        output.append("\nISSUES:")
+        yield "\nISSUES:\n"
         for issue in report['issues']:
-            output.append(f"\n  [{issue['severity'].upper()}] {issue['type']}")
+            yield f"\n  [{issue['severity'].upper()}] {issue['type']}\n"
             if 'line' in issue:
-                output.append(f"  Line: {issue['line']}")
-            output.append(f"  Problem: {issue['message']}")
+                yield f"  Line: {issue['line']}\n"
+            yield f"  Problem: {issue['message']}\n"
             if 'penalty' in issue:
-                output.append(f"  Penalty: {issue['penalty']} points")
+                yield f"  Penalty: {issue['penalty']} points\n"
             if 'suggestion' in issue:
-                output.append(f"  Suggestion: {issue['suggestion']}")
+                yield f"  Suggestion: {issue['suggestion']}\n"
     
     if report['warnings']:
-        output.append("\nWARNINGS:")
+        yield "\nWARNINGS:\n"
         for warning in report['warnings']:
-            output.append(f"\n  [{warning.get('severity', 'medium').upper()}] {warning['type']}")
+            yield f"\n  [{warning.get('severity', 'medium').upper()}] {warning['type']}\n"
             if 'line' in warning:
-                output.append(f"  Line: {warning['line']}")
-            output.append(f"  Problem: {warning['message']}")
+                yield f"  Line: {warning['line']}\n"
+            yield f"  Problem: {warning['message']}\n"
             if 'penalty' in warning:
-                output.append(f"  Penalty: {warning['penalty']} points")
+                yield f"  Penalty: {warning['penalty']} points\n"
             if 'suggestion' in warning:
-                output.append(f"  Suggestion: {warning['suggestion']}")
+                yield f"  Suggestion: {warning['suggestion']}\n"
     
     if report['info']:
-        output.append("\nINFO:")
+        yield "\nINFO:\n"
         for info in report['info'][:5]:  # Show first 5 info items
-            output.append(f"\n  {info['type']}")
-            output.append(f"  {info['message']}")
+            yield f"\n  {info['type']}\n"
+            yield f"  {info['message']}\n"
             if 'suggestion' in info:
-                output.append(f"  Suggestion: {info['suggestion']}")
+                yield f"  Suggestion: {info['suggestion']}\n"
     
     if not report['issues'] and not report['warnings']:
-        output.append("\nNo critical issues found! Good C++ quality!")
+        yield "\nNo critical issues found! Good C++ quality!\n"
     
-    output.append("\n" + "=" * 70)
-    return "\n".join(output)
+    yield "\n" + "=" * 70 + "\n"
+
+
+def format_text_report(report: Dict) -> str:
+    """Format the report as human-readable text."""
+    return "".join(_iter_text_report(report))
 
 
 def main():
@@ -329,19 +374,18 @@ def main():
     
     # Output JSON report
     json_filename = args.output_json or f"{Path(args.filepath).stem}_quality_report.json"
-    with open(json_filename, 'w') as f:
-        json.dump(report, f, indent=2)
+    with open(json_filename, 'wb') as f:
+        f.write(dump_json(report))
     print(f"JSON report saved to: {json_filename}")
     
     # Output text report
-    text_report = format_text_report(report)
     text_filename = args.output_text or f"{Path(args.filepath).stem}_quality_report.txt"
     with open(text_filename, 'w') as f:
-        f.write(text_report)
+        f.writelines(_iter_text_report(report))
     print(f"Text report saved to: {text_filename}")
     
     # Print to console
-    print(text_report)
+    sys.stdout.writelines(_iter_text_report(report))
     
     # Exit with error code if score is too low
     if report['overall_score'] < 70:
@@ -1,48 +1,265 @@
 """Analyze C++ code quality and generate metrics."""
 
 import argparse
+import functools
+import hashlib
 import json
 import os
-import re
-import subprocess
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+from cpp_scan import read_source, scan
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+_HEADER_SUFFIXES = ('.h', '.hpp')
+
+# Bump whenever a check here or in cpp_scan.py changes so stale cache
+# entries are not reused
+_CACHE_VERSION = b'4'
+
+
+def _content_digest(content: bytes, is_header: bool) -> str:
+    """Cache key for one file: its bytes plus what kind of result it needs."""
+    key = _CACHE_VERSION + (b'h' if is_header else b's')
+    if xxhash is not None:
+        hasher = xxhash.xxh3_64(key)
+    else:
+        hasher = hashlib.blake2b(key, digest_size=16)
+    hasher.update(content)
+    return hasher.hexdigest()
+
+
+def _relocate(result: Dict, file_path: str) -> Dict:
+    """Point a cached result at the file it is being reused for."""
+    result['file'] = file_path
+    for issue in result['best_practices']:
+        issue['file'] = file_path
+    if 'complexity' in result:
+        result['complexity']['file'] = file_path
+        for issue in result['perf']:
+            issue['file'] = file_path
+    return result
+
+
+def _analyze_one(source_dir: Path, cache_dir: Optional[Path], cpp_file: Path) -> Dict:
+    """Read one file once and run every per-file check on it.
+    
+    Headers only feed the best-practice checks; complexity, line metrics,
+    performance patterns and includes are collected for .cpp files. With a
+    cache directory, results are stored under a hash of the file contents
+    and reused while the file is unchanged; a result that cannot be stored
+    is returned uncached.
+    """
+    content = read_source(cpp_file)
+    
+    file_path = str(cpp_file.relative_to(source_dir))
+    is_header = cpp_file.suffix in _HEADER_SUFFIXES
+    
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = cache_dir / f"{_content_digest(content, is_header)}.json"
+        try:
+            with open(cache_file, 'rb') as f:
+                raw = f.read()
+            return _relocate(orjson.loads(raw) if orjson is not None else json.loads(raw), file_path)
+        except (OSError, ValueError):
+            pass
+    
+    findings = scan(content)
+    result = {
+        'file': file_path,
+        'best_practices': _check_best_practices(findings, file_path, is_header),
+    }
+    if not is_header:
+        result['complexity'] = _check_complexity(findings, file_path)
+        result['metrics'] = _count_lines(findings, content)
+        result['perf'] = _check_performance(findings, file_path)
+        result['includes'] = findings['includes']
+        result['system_includes'] = findings['system_includes']
+    
+    if cache_file is not None:
+        # Write then rename so concurrent workers never read a partial entry
+        tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(result) if orjson is not None else json.dumps(result).encode())
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
+    return result
+
+
+def _check_complexity(findings: Dict, file_path: str) -> Dict:
+    """Average decision points per function for one file."""
+    functions = findings['functions']
+    decision_points = findings['decision_points']
+    
+    return {
+        'file': file_path,
+        'complexity': decision_points / max(functions, 1),
+        'functions': functions,
+        'decision_points': decision_points
+    }
+
+
+def _count_lines(findings: Dict, content: bytes) -> Tuple[int, int, int]:
+    """Return (code, comment, blank) line counts for one file."""
+    comments = findings['comment_lines']
+    blank = findings['blank_lines']
+    total = findings['total_lines']
+    if not content or content.endswith(b'\n'):
+        # The scan counts the empty text after a final newline as a blank
+        # line; readlines() never produced it
+        total -= 1
+        blank -= 1
+    return total - comments - blank, comments, blank
+
+
+def _check_best_practices(findings: Dict, file_path: str, is_header: bool) -> List[Dict]:
+    """Best-practice issues for one file."""
+    issues = []
+    
+    # Check for raw pointers (prefer smart pointers)
+    if findings['raw_new']:
+        issues.append({
+            'file': file_path,
+            'issue': 'Using raw new (consider smart pointers)',
+            'severity': 'warning'
+        })
+    
+    # Check for manual memory management
+    if findings['manual_delete']:
+        issues.append({
+            'file': file_path,
+            'issue': 'Manual delete (consider RAII)',
+            'severity': 'warning'
+        })
+    
+    # Check for C-style casts (more precise regex)
+    if findings['c_casts']:
+        issues.append({
+            'file': file_path,
+            'issue': 'C-style cast detected (use static_cast/dynamic_cast)',
+            'severity': 'info'
+        })
+    
+    # Check for using namespace std in headers
+    if is_header and findings['using_namespace_std']:
+        issues.append({
+            'file': file_path,
+            'issue': 'using namespace std in header file',
+            'severity': 'error'
+        })
+    
+    # Check for missing virtual destructor in base classes
+    if findings['missing_virtual_destructor']:
+        issues.append({
+            'file': file_path,
+            'issue': 'Class with virtual methods missing virtual destructor',
+            'severity': 'warning'
+        })
+    
+    return issues
+
+
+def _check_performance(findings: Dict, file_path: str) -> List[Dict]:
+    """Performance-pattern issues for one file."""
+    performance_issues = []
+    
+    # Check for pass-by-value of large objects
+    if findings['vector_by_value']:
+        performance_issues.append({
+            'file': file_path,
+            'issue': 'Potential pass-by-value of vector (consider const reference)',
+            'impact': 'high'
+        })
+    
+    # Check for string concatenation in loops
+    if findings['string_concat_in_loop']:
+        performance_issues.append({
+            'file': file_path,
+            'issue': 'String concatenation in loop (consider stringstream)',
+            'impact': 'medium'
+        })
+    
+    # Check for unnecessary copies
+    if findings['auto_copy']:
+        performance_issues.append({
+            'file': file_path,
+            'issue': 'Potential unnecessary copy (consider auto&)',
+            'impact': 'medium'
+        })
+    
+    # Check for inefficient container access
+    if findings['vector_index_loop']:
+        performance_issues.append({
+            'file': file_path,
+            'issue': 'Consider range-based for loop for better performance',
+            'impact': 'low'
+        })
+    
+    return performance_issues
 
 
 class CppAnalyzer:
-    def __init__(self, source_dir: str):
+    def __init__(self, source_dir: str, max_workers: Optional[int] = None,
+                 cache_dir: Optional[str] = None):
         self.source_dir = Path(source_dir)
+        self.max_workers = max_workers
+        self.cache_dir = Path(cache_dir) if cache_dir else None
         self.metrics = {}
+        self._files = self._collect()
+        self._results = None
+    
+    def _collect(self) -> Dict[str, List[Path]]:
+        """Walk the source tree once and bucket C++ files by kind."""
+        files = {'cpp': [], 'header': []}
+        for dirpath, _, filenames in os.walk(self.source_dir):
+            directory = Path(dirpath)
+            for filename in filenames:
+                suffix = os.path.splitext(filename)[1]
+                if suffix == '.cpp':
+                    files['cpp'].append(directory / filename)
+                elif suffix in _HEADER_SUFFIXES:
+                    files['header'].append(directory / filename)
+        return files
+    
+    def _scan(self) -> List[Dict]:
+        """Analyze every source file once, in parallel, and cache the results.
+        
+        Results for .cpp files come first, then headers.
+        """
+        if self._results is None:
+            paths = self._files['cpp'] + self._files['header']
+            if self.cache_dir is not None:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+            worker = functools.partial(_analyze_one, self.source_dir, self.cache_dir)
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                self._results = list(executor.map(worker, paths, chunksize=32))
+        return self._results
+    
+    def _source_results(self) -> List[Dict]:
+        """Cached results for .cpp files only."""
+        return self._scan()[:len(self._files['cpp'])]
     
     def analyze_complexity(self) -> Dict:
         """Analyze cyclomatic complexity of C++ code."""
-        complexity_scores = []
-        
-        for cpp_file in self.source_dir.rglob("*.cpp"):
-            with open(cpp_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            # Count decision points
-            decision_points = (
-                content.count('if') +
-                content.count('for') +
-                content.count('while') +
-                content.count('case') +
-                content.count('&&') +
-                content.count('||') +
-                content.count('?')
-            )
-            
-            # Count functions
-            functions = len(re.findall(r'\w+\s+\w+\s*\([^)]*\)\s*{', content))
-            
-            avg_complexity = decision_points / max(functions, 1)
-            complexity_scores.append({
-                'file': str(cpp_file.relative_to(self.source_dir)),
-                'complexity': avg_complexity,
-                'functions': functions,
-                'decision_points': decision_points
-            })
+        complexity_scores = [result['complexity'] for result in self._source_results()]
         
         return {
             'files': complexity_scores,
@@ -56,37 +273,9 @@ class CppAnalyzer:
         total_blank = 0
         file_count = 0
         
-        for cpp_file in self.source_dir.rglob("*.cpp"):
+        for result in self._source_results():
             file_count += 1
-            with open(cpp_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-            
-            loc = 0
-            comments = 0
-            blank = 0
-            in_multiline_comment = False
-            
-            for line in lines:
-                stripped = line.strip()
-                
-                if not stripped:
-                    blank += 1
-                elif stripped.startswith('//'):
-                    comments += 1
-                elif '/*' in stripped and '*/' in stripped:
-                    # Single line /* */ comment
-                    comments += 1
-                elif '/*' in stripped:
-                    comments += 1
-                    in_multiline_comment = True
-                elif '*/' in stripped:
-                    comments += 1
-                    in_multiline_comment = False
-                elif in_multiline_comment:
-                    comments += 1
-                else:
-                    loc += 1
-            
+            loc, comments, blank = result['metrics']
             total_loc += loc
             total_comments += comments
             total_blank += blank
@@ -105,150 +294,65 @@ class CppAnalyzer:
     
     def check_best_practices(self) -> Dict:
         """Check for C++ best practices."""
-        issues = []
-        
-        # Check both .cpp and .h files
-        for extension in ["*.cpp", "*.h", "*.hpp"]:
-            for cpp_file in self.source_dir.rglob(extension):
-                with open(cpp_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                
-                file_path = str(cpp_file.relative_to(self.source_dir))
-                
-                # Check for raw pointers (prefer smart pointers)
-                if re.search(r'\bnew\s+\w+', content):
-                    issues.append({
-                        'file': file_path,
-                        'issue': 'Using raw new (consider smart pointers)',
-                        'severity': 'warning'
-                    })
-                
-                # Check for manual memory management
-                if re.search(r'\bdelete\b', content):
-                    issues.append({
-                        'file': file_path,
-                        'issue': 'Manual delete (consider RAII)',
-                        'severity': 'warning'
-                    })
-                
-                # Check for C-style casts (more precise regex)
-                if re.search(r'\([a-zA-Z_]\w*\s*\*?\s*\)\s*[a-zA-Z_]', content):
-                    issues.append({
-                        'file': file_path,
-                        'issue': 'C-style cast detected (use static_cast/dynamic_cast)',
-                        'severity': 'info'
-                    })
-                
-                # Check for using namespace std in headers
-                if cpp_file.suffix in ['.h', '.hpp'] and 'using namespace std' in content:
-                    issues.append({
-                        'file': file_path,
-                        'issue': 'using namespace std in header file',
-                        'severity': 'error'
-                    })
-                
-                # Check for missing virtual destructor in base classes
-                if re.search(r'class\s+\w+.*{', content) and 'virtual' in content and not re.search(r'virtual\s+~\w+', content):
-                    issues.append({
-                        'file': file_path,
-                        'issue': 'Class with virtual methods missing virtual destructor',
-                        'severity': 'warning'
-                    })
+        issues = [issue for result in self._scan() for issue in result['best_practices']]
+        severity_counts = Counter(i['severity'] for i in issues)
         
         return {
             'issues': issues,
             'issue_count': len(issues),
-            'errors': len([i for i in issues if i['severity'] == 'error']),
-            'warnings': len([i for i in issues if i['severity'] == 'warning']),
-            'info': len([i for i in issues if i['severity'] == 'info'])
+            'errors': severity_counts['error'],
+            'warnings': severity_counts['warning'],
+            'info': severity_counts['info']
         }
     
     def analyze_performance_patterns(self) -> Dict:
         """Check for common performance issues."""
-        performance_issues = []
-        
-        for cpp_file in self.source_dir.rglob("*.cpp"):
-            with open(cpp_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            file_path = str(cpp_file.relative_to(self.source_dir))
-            
-            # Check for pass-by-value of large objects
-            if re.search(r'\w+\s+\w+\(.*vector<.*>\s+\w+.*\)', content):
-                performance_issues.append({
-                    'file': file_path,
-                    'issue': 'Potential pass-by-value of vector (consider const reference)',
-                    'impact': 'high'
-                })
-            
-            # Check for string concatenation in loops
-            if re.search(r'for\s*\([^)]*\)\s*{[^}]*\+\s*=.*string', content, re.MULTILINE | re.DOTALL):
-                performance_issues.append({
-                    'file': file_path,
-                    'issue': 'String concatenation in loop (consider stringstream)',
-                    'impact': 'medium'
-                })
-            
-            # Check for unnecessary copies
-            if re.search(r'auto\s+\w+\s*=\s*container\.', content):
-                performance_issues.append({
-                    'file': file_path,
-                    'issue': 'Potential unnecessary copy (consider auto&)',
-                    'impact': 'medium'
-                })
-            
-            # Check for inefficient container access
-            if re.search(r'vector.*\[\].*loop', content) and 'at(' not in content:
-                performance_issues.append({
-                    'file': file_path,
-                    'issue': 'Consider range-based for loop for better performance',
-                    'impact': 'low'
-                })
+        performance_issues = [issue for result in self._source_results() for issue in result['perf']]
+        impact_counts = Counter(i['impact'] for i in performance_issues)
         
         return {
             'performance_issues': performance_issues,
             'total_issues': len(performance_issues),
-            'high_impact': len([i for i in performance_issues if i['impact'] == 'high']),
-            'medium_impact': len([i for i in performance_issues if i['impact'] == 'medium']),
-            'low_impact': len([i for i in performance_issues if i['impact'] == 'low'])
+            'high_impact': impact_counts['high'],
+            'medium_impact': impact_counts['medium'],
+            'low_impact': impact_counts['low']
         }
     
-    def analyze_dependencies(self) -> Dict:
-        """Analyze include dependencies."""
+    def analyze_dependencies(self, keep_per_file: bool = False) -> Dict:
+        """Analyze include dependencies.
+        
+        The per-file include lists are only reported when keep_per_file is set.
+        """
         includes = {}
         system_includes = set()
         local_includes = set()
         
-        for cpp_file in self.source_dir.rglob("*.cpp"):
-            with open(cpp_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            file_path = str(cpp_file.relative_to(self.source_dir))
-            file_includes = []
+        for result in self._source_results():
+            file_includes = result['includes']
+            file_system_includes = result['system_includes']
             
-            # Find all includes
-            include_pattern = r'#include\s*[<"](.*?)[>"]'
-            matches = re.findall(include_pattern, content)
+            system_includes.update(file_system_includes)
+            local_includes.update(include for include in file_includes
+                                  if include not in file_system_includes)
             
-            for include in matches:
-                file_includes.append(include)
-                if include.startswith('<') or not include.endswith('.h'):
-                    system_includes.add(include)
-                else:
-                    local_includes.add(include)
-            
-            includes[file_path] = file_includes
+            if keep_per_file:
+                includes[result['file']] = file_includes
         
-        return {
-            'file_includes': includes,
+        dependencies = {
             'system_includes': list(system_includes),
             'local_includes': list(local_includes),
             'total_system_includes': len(system_includes),
             'total_local_includes': len(local_includes)
         }
+        if keep_per_file:
+            dependencies['file_includes'] = includes
+        return dependencies
     
-    def generate_report(self) -> Dict:
+    def generate_report(self, include_deps: bool = False) -> Dict:
         """Generate complete analysis report."""
+        print("Scanning source files...")
+        self._scan()
+        
         print("Analyzing complexity...")
         complexity = self.analyze_complexity()
         
@@ -262,7 +366,7 @@ class CppAnalyzer:
         performance = self.analyze_performance_patterns()
         
         print("Analyzing dependencies...")
-        dependencies = self.analyze_dependencies()
+        dependencies = self.analyze_dependencies(keep_per_file=include_deps)
         
         # Calculate overall quality score
         quality_score = self.calculate_quality_score(complexity, metrics, best_practices, performance)
@@ -324,11 +428,24 @@ class CppAnalyzer:
         }
 
 
+def dump_json(report: Dict) -> bytes:
+    """Serialize a report as indented JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2)
+    return json.dumps(report, indent=2).encode()
+
+
 def main():
     parser = argparse.ArgumentParser(description='Analyze C++ code quality and generate metrics')
     parser.add_argument('source_dir', help='Directory containing C++ source files')
     parser.add_argument('-o', '--output', help='Output file for JSON report (default: stdout)')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Worker processes for the file scan (default: one per CPU)')
+    parser.add_argument('--include-deps', action='store_true',
+                        help='Include the per-file #include lists in the report')
+    parser.add_argument('--cache-dir',
+                        help='Reuse per-file results stored here for files whose contents are unchanged')
     
     args = parser.parse_args()
     
@@ -336,18 +453,18 @@ def main():
         print(f"Error: Source directory '{args.source_dir}' does not exist")
         return 1
     
-    analyzer = CppAnalyzer(args.source_dir)
+    analyzer = CppAnalyzer(args.source_dir, max_workers=args.jobs, cache_dir=args.cache_dir)
     
     try:
-        report = analyzer.generate_report()
+        report = analyzer.generate_report(include_deps=args.include_deps)
         
         if args.output:
-            with open(args.output, 'w') as f:
-                json.dump(report, f, indent=2)
+            with open(args.output, 'wb') as f:
+                f.write(dump_json(report))
             print(f"Report saved to {args.output}")
         else:
             if args.verbose:
-                print(json.dumps(report, indent=2))
+                print(dump_json(report).decode())
             else:
                 # Print summary
                 print(f"\n=== C++ Code Quality Report ===")
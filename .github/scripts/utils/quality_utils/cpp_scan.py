@@ -0,0 +1,209 @@
+"""
+Shared C++ scanning core for cpp_analyzer.py and cpp_analyzer_dir.py.
+Runs every pattern check over a file's raw bytes and returns plain counts
+and flags; scoring and report formatting stay in the analyzers.
+"""
+
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Tuple, Union
+
+
+# Function headers (group 1) and decision points (if, for, while, case, &&,
+# ||, ?) matched in one pass. The leading \b keeps a failed header attempt
+# from being retried at every offset inside the same word, and keywords
+# must be whole words so "lifetime" or "format" do not count.
+_COMPLEXITY_RE = re.compile(
+    rb'\b(?:(\w+\s+\w+\s*\([^)]*\)\s*(?:const\s*)?\{)|(?:if|for|while|case)\b)|&&|\|\||\?')
+
+# Best-practice checks
+_RAW_NEW_RE = re.compile(rb'\bnew\s+\w+')
+_DELETE_RE = re.compile(rb'\bdelete\b')
+_C_CAST_RE = re.compile(rb'\([a-zA-Z_]\w*\s*\*?\s*\)\s*[a-zA-Z_]')
+# A class definition, with its brace on the same line or a later one;
+# forward declarations (class Foo;) do not match
+_CLASS_BODY_RE = re.compile(rb'class\s+\w+[^;{]*\{')
+_VIRTUAL_DESTRUCTOR_RE = re.compile(rb'virtual\s+~\w+')
+_NULL_RE = re.compile(rb'\bNULL\b')
+_POINTER_DECL_RE = re.compile(rb'\b\w+\s*\*\s*\w+\s*;')
+
+# Performance patterns
+_VECTOR_BY_VALUE_RE = re.compile(rb'\w+\s+\w+\(.*vector<.*>\s+\w+.*\)')
+_STRING_CONCAT_LOOP_RE = re.compile(rb'for\s*\([^)]*\)\s*{[^}]*\+\s*=.*string', re.MULTILINE | re.DOTALL)
+_AUTO_COPY_RE = re.compile(rb'auto\s+\w+\s*=\s*container\.')
+_VECTOR_INDEX_LOOP_RE = re.compile(rb'vector.*\[\].*loop')
+
+_INCLUDE_RE = re.compile(rb'#include\s*([<"])(.*?)[>"]')
+
+# C++ standard library and C compatibility headers; these are system
+# includes however they are spelled
+_STD_HEADERS = frozenset({
+    # C++ standard library
+    'algorithm', 'any', 'array', 'atomic', 'barrier', 'bit', 'bitset', 'charconv',
+    'chrono', 'codecvt', 'compare', 'complex', 'concepts', 'condition_variable',
+    'coroutine', 'deque', 'exception', 'execution', 'expected', 'filesystem',
+    'format', 'forward_list', 'fstream', 'functional', 'future', 'generator',
+    'initializer_list', 'iomanip', 'ios', 'iosfwd', 'iostream', 'istream',
+    'iterator', 'latch', 'limits', 'list', 'locale', 'map', 'mdspan', 'memory',
+    'memory_resource', 'mutex', 'new', 'numbers', 'numeric', 'optional',
+    'ostream', 'print', 'queue', 'random', 'ranges', 'ratio', 'regex',
+    'scoped_allocator', 'semaphore', 'set', 'shared_mutex', 'source_location',
+    'span', 'spanstream', 'sstream', 'stack', 'stacktrace', 'stdexcept',
+    'stdfloat', 'stop_token', 'streambuf', 'string', 'string_view',
+    'syncstream', 'system_error', 'thread', 'tuple', 'type_traits',
+    'typeindex', 'typeinfo', 'unordered_map', 'unordered_set', 'utility',
+    'valarray', 'variant', 'vector', 'version',
+    # C compatibility, in both spellings
+    'cassert', 'cctype', 'cerrno', 'cfenv', 'cfloat', 'cinttypes', 'climits',
+    'clocale', 'cmath', 'csetjmp', 'csignal', 'cstdarg', 'cstddef', 'cstdint',
+    'cstdio', 'cstdlib', 'cstring', 'ctime', 'cuchar', 'cwchar', 'cwctype',
+    'assert.h', 'ctype.h', 'errno.h', 'fenv.h', 'float.h', 'inttypes.h',
+    'limits.h', 'locale.h', 'math.h', 'setjmp.h', 'signal.h', 'stdarg.h',
+    'stddef.h', 'stdint.h', 'stdio.h', 'stdlib.h', 'string.h', 'time.h',
+    'uchar.h', 'wchar.h', 'wctype.h',
+})
+
+# Line classes for comment ratios, matched against the text with a newline
+# added at both ends so every line starts with a literal '\n' (far cheaper
+# for the regex engine to find than a MULTILINE '^')
+_BLANK_LINE_RE = re.compile(rb'\n[ \t\r\f\v]*(?=\n)')
+_LINE_COMMENT_RE = re.compile(rb'\n[ \t\r\f\v]*//')
+_BLOCK_COMMENT_RE = re.compile(rb'//[^\n]*|/\*.*?(?:\*/|(?=\n\Z))', re.DOTALL)
+
+# Comments and string/char literals, removed before the pattern checks so
+# commented-out code and text inside literals cannot trigger them
+_COMMENT_OR_LITERAL_RE = re.compile(
+    rb'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'', re.DOTALL)
+
+
+def _blank_out(match) -> bytes:
+    """Replacement for one comment or literal: keep quotes and line breaks."""
+    text = match.group(0)
+    if text[:1] in (b'"', b"'"):
+        return text[:1] * 2
+    return b'\n' * text.count(b'\n') or b' '
+
+
+def read_source(path: Union[str, os.PathLike]) -> bytes:
+    """Read a whole file with as few syscalls as possible.
+
+    open/fstat/read/close only: skipping the buffered-file machinery saves
+    the isatty, seek and trailing EOF read that open().read() issues, which
+    adds up over thousands of small sources.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size + 1)
+        if len(data) == size:
+            return data
+        # Short read, or the file changed size since fstat; read to EOF
+        chunks = [data]
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return b''.join(chunks)
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+
+
+def strip_cpp(content: bytes) -> bytes:
+    """Return the code-only view of a C++ source."""
+    if b'/' not in content and b'"' not in content and b"'" not in content:
+        return content
+    return _COMMENT_OR_LITERAL_RE.sub(_blank_out, content)
+
+
+def count_lines(content: bytes) -> Tuple[int, int, int]:
+    """Return (total, comment, blank) line counts, as content.split(b'\\n') sees lines."""
+    text = b'\n' + content + b'\n'
+    total_lines = content.count(b'\n') + 1
+    blank_lines = sum(1 for _ in _BLANK_LINE_RE.finditer(text))
+    comment_lines = sum(1 for _ in _LINE_COMMENT_RE.finditer(text))
+
+    if b'/*' not in content:
+        return total_lines, comment_lines, blank_lines
+
+    # Lines touched by /* */ blocks, less the blank and // lines inside
+    # them that were already counted above
+    last_line_end = -1
+    for match in _BLOCK_COMMENT_RE.finditer(text):
+        start, end = match.span()
+        if text.startswith(b'//', start):
+            continue  # a /* after // is not a block
+        newlines = text.count(b'\n', start, end)
+        lines = newlines + 1
+        if newlines:
+            lines -= sum(1 for _ in _BLANK_LINE_RE.finditer(text, start, end + 1))
+            lines -= sum(1 for _ in _LINE_COMMENT_RE.finditer(text, start, end))
+        if text.rfind(b'\n', 0, start) < last_line_end:
+            lines -= 1  # starts on the line the previous block ended on
+        line_end = text.find(b'\n', end)
+        if newlines and text[end:line_end].strip()[:1] not in (b'', b'/'):
+            # Code follows the */ that closes a multi-line block, so its
+            # closing line is a code line
+            lines -= 1
+            last_line_end = -1
+        else:
+            last_line_end = line_end
+        comment_lines += lines
+
+    return total_lines, comment_lines, blank_lines
+
+
+def scan(content: bytes) -> Dict:
+    """Run every check on one file's bytes and return the raw findings.
+
+    Line counts and include names come from the original text; the pattern
+    checks run on the shorter code-only view. All patterns are ASCII, so the
+    bytes never need decoding; only include names are decoded.
+    """
+    code = strip_cpp(content)
+
+    counts = Counter(match.lastindex for match in _COMPLEXITY_RE.finditer(code))
+    functions = counts[1]
+    total_lines, comment_lines, blank_lines = count_lines(content)
+    has_vector = b'vector' in code
+
+    # Keyword substring tests gate the regexes; most files lack most keywords
+    return {
+        'functions': functions,
+        'decision_points': sum(counts.values()) - functions,
+        'total_lines': total_lines,
+        'comment_lines': comment_lines,
+        'blank_lines': blank_lines,
+        'raw_new': b'new' in code and _RAW_NEW_RE.search(code) is not None,
+        'manual_delete': b'delete' in code and _DELETE_RE.search(code) is not None,
+        'c_casts': sum(1 for _ in _C_CAST_RE.finditer(code)),
+        'using_namespace_std': b'using namespace std' in code,
+        'missing_virtual_destructor': (
+            b'virtual' in code and b'class' in code
+            and not _VIRTUAL_DESTRUCTOR_RE.search(code) and _CLASS_BODY_RE.search(code) is not None),
+        'null_macro': b'NULL' in code and _NULL_RE.search(code) is not None,
+        'pointer_declarations': sum(1 for _ in _POINTER_DECL_RE.finditer(code)) if b'*' in code else 0,
+        'vector_by_value': has_vector and _VECTOR_BY_VALUE_RE.search(code) is not None,
+        'string_concat_in_loop': (
+            b'for' in code and b'string' in code and _STRING_CONCAT_LOOP_RE.search(code) is not None),
+        'auto_copy': b'container.' in code and _AUTO_COPY_RE.search(code) is not None,
+        'vector_index_loop': (
+            has_vector and b'at(' not in code and _VECTOR_INDEX_LOOP_RE.search(code) is not None),
+        **scan_includes(content),
+    }
+
+
+def scan_includes(content: bytes) -> Dict[str, List[str]]:
+    """Names of all #include directives in order, and those that are system headers.
+
+    A header is a system header when it is part of the standard library or
+    is included with angle brackets.
+    """
+    includes = []
+    system_includes = []
+    for delimiter, include in _INCLUDE_RE.findall(content):
+        name = include.decode('utf-8', errors='ignore')
+        includes.append(name)
+        if delimiter == b'<' or name in _STD_HEADERS:
+            system_includes.append(name)
+    return {'includes': includes, 'system_includes': system_includes}
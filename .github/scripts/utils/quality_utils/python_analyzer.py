@@ -7,51 +7,143 @@ Compatible with CI/CD workflows that process files one at a time.
 
 import argparse
 import ast
+import functools
+import hashlib
 import json
+import os
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 import re
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+# Naming conventions
+_SNAKE_CASE_RE = re.compile(r'^[a-z_][a-z0-9_]*$')
+_PASCAL_CASE_RE = re.compile(r'^[A-Z][a-zA-Z0-9]*$')
+
+# Source-level checks
+_WILDCARD_IMPORT_RE = re.compile(r'from .* import \*')
+_LIST_MEMBERSHIP_RE = re.compile(r'\bin\s+\[')
+_SHELL_TRUE_RE = re.compile(r'subprocess\.[^(]*\([^)]*shell\s*=\s*True')
+# Case-insensitive checks, matched against the lowercased file: a literal
+# alternation is far cheaper for the regex engine to find without
+# IGNORECASE. The whole file is scanned at once, so whitespace and quoted
+# values must not cross a line break.
+_HARDCODED_SECRET_RE = re.compile(
+    r'(?:password|secret|key|token)[^\S\n]*=[^\S\n]*["\'][^"\'{}$\n]+["\']')
+_SQL_FORMAT_RE = re.compile(r'(?:select|insert|update|delete).*%')
+
+# Files shorter than this with no function or class definitions only get
+# the security checks; style and documentation ratios over a handful of
+# lines (package __init__ modules, constants) say nothing useful
+_TRIVIAL_FILE_LINES = 20
+
+# Node types compared with type(node) in ...: a set lookup instead of
+# isinstance() walking each class in a tuple. AST node classes are never
+# subclassed by the parser, so exact types are enough.
+_DEFINITION_TYPES = frozenset({ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef})
+_MUTABLE_DEFAULT_TYPES = frozenset({ast.List, ast.Dict, ast.Set})
+
+# Nodes that never have child nodes to visit; together they are about a
+# third of a typical tree
+_LEAF_TYPES = frozenset({ast.Name, ast.Constant})
+
+# Bump whenever a check changes so stale cache entries are not reused
+_CACHE_VERSION = b'2'
+
+
+def _content_digest(content: str) -> str:
+    """Cache key for one file's source."""
+    if xxhash is not None:
+        hasher = xxhash.xxh3_64(_CACHE_VERSION)
+    else:
+        hasher = hashlib.blake2b(_CACHE_VERSION, digest_size=16)
+    hasher.update(content.encode('utf-8', errors='surrogatepass'))
+    return hasher.hexdigest()
+
 
 class PythonFileAnalyzer:
     """Analyzes a single Python file for quality metrics."""
     
-    def __init__(self, filepath: str):
+    def __init__(self, filepath: str, cache_dir: Optional[str] = None):
         self.filepath = Path(filepath)
         self.filename = self.filepath.name
+        self.cache_dir = Path(cache_dir) if cache_dir else None
         self.score = 100
+        # Points lost per finding; the score is worked out once, in
+        # _generate_report
+        self._penalties = []
         self.issues = []
         self.warnings = []
         self.info = []
+        self._content = None
+    
+    @classmethod
+    def from_string(cls, content: str, name: str = '<stdin>',
+                    cache_dir: Optional[str] = None) -> 'PythonFileAnalyzer':
+        """Create an analyzer for source already in memory, reported under name."""
+        analyzer = cls(name, cache_dir=cache_dir)
+        analyzer._content = content
+        return analyzer
+        
+    def analyze(self, content: Optional[str] = None) -> Dict:
+        """Run all analysis checks on the Python file.
         
-    def analyze(self) -> Dict:
-        """Run all analysis checks on the Python file."""
+        content, when given, is the already-read source of the file and
+        saves reading it again; analyzers made by from_string() never read
+        the file. With a cache directory, reports are stored under a hash
+        of the source and reused while it is unchanged; a report that
+        cannot be stored is returned uncached.
+        """
         try:
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            lines = content.split('\n')
+            if content is None:
+                content = self._content
+            if content is None:
+                with open(self.filepath, 'r', encoding='utf-8') as f:
+                    content = f.read()
             
-            # Parse AST
-            try:
-                tree = ast.parse(content, filename=str(self.filepath))
-            except SyntaxError as e:
-                return {
-                    'error': f'Syntax error: {str(e)}',
-                    'filepath': str(self.filepath),
-                    'score': 0
-                }
+            cache_file = None
+            if self.cache_dir is not None:
+                cache_file = self.cache_dir / f"{_content_digest(content)}.json"
+                try:
+                    with open(cache_file, 'rb') as f:
+                        raw = f.read()
+                    report = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                    report['filepath'] = str(self.filepath)
+                    report['filename'] = self.filename
+                    return report
+                except (OSError, ValueError):
+                    pass
             
-            # Run all checks
-            self._check_complexity(tree)
-            self._check_code_metrics(lines, tree)
-            self._check_pep8_style(lines, tree)
-            self._check_best_practices(tree, content)
-            self._check_performance(tree, content)
-            self._check_security(content, lines)
+            report = self._analyze_content(content)
             
-            return self._generate_report()
+            # Syntax error messages name the file, so only clean reports
+            # are stored
+            if cache_file is not None and 'error' not in report:
+                # Write then rename so concurrent workers never read a partial entry
+                tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+                try:
+                    with open(tmp_file, 'wb') as f:
+                        f.write(orjson.dumps(report) if orjson is not None else json.dumps(report).encode())
+                    os.replace(tmp_file, cache_file)
+                except OSError:
+                    try:
+                        tmp_file.unlink()
+                    except OSError:
+                        pass
+            return report
             
         except Exception as e:
             return {
@@ -60,16 +152,55 @@ class PythonFileAnalyzer:
                 'score': 0
             }
     
-    def _check_complexity(self, tree: ast.AST):
-        """Analyze cyclomatic complexity."""
-        analyzer = ComplexityAnalyzer()
-        analyzer.visit(tree)
-        complexity_data = analyzer.get_complexity()
+    def _analyze_content(self, content: str) -> Dict:
+        """Run every check on the file's source and build the report."""
+        # Only '\n' ends a line: text mode has already folded '\r\n' and '\r'
+        # into it, and splitlines() would also split on the form feeds and
+        # other separators that Python's own line numbers ignore. The empty
+        # text after a final newline is not a line.
+        lines = content.split('\n')
+        if not lines[-1]:
+            lines.pop()
+        
+        # Parse AST
+        try:
+            tree = ast.parse(content, filename=str(self.filepath))
+        except SyntaxError as e:
+            return {
+                'error': f'Syntax error: {str(e)}',
+                'filepath': str(self.filepath),
+                'score': 0
+            }
+        
+        if len(lines) < _TRIVIAL_FILE_LINES and not any(
+                type(node) in _DEFINITION_TYPES for node in tree.body):
+            self._check_security(content)
+            report = self._generate_report()
+            report['note'] = 'trivial file: only security checks run'
+            return report
+        
+        # One traversal gathers everything the AST checks need, and one
+        # pass over the lines everything the line-based checks need
+        visitor = AnalysisVisitor()
+        visitor.visit(tree)
+        line_stats = self._scan_lines(lines)
         
-        avg_complexity = complexity_data['total_complexity'] / max(len(complexity_data['functions']), 1)
+        # Run all checks
+        self._check_complexity(visitor)
+        self._check_code_metrics(line_stats, visitor)
+        self._check_pep8_style(line_stats, visitor)
+        self._check_best_practices(visitor, content)
+        self._check_performance(visitor, content)
+        self._check_security(content)
+        
+        return self._generate_report()
+    
+    def _check_complexity(self, visitor: 'AnalysisVisitor'):
+        """Analyze cyclomatic complexity."""
+        avg_complexity = visitor.complexity / max(len(visitor.functions), 1)
         
         if avg_complexity > 15:
-            self.score -= 25
+            self._penalties.append(25)
             self.issues.append({
                 'type': 'HIGH_COMPLEXITY',
                 'severity': 'high',
@@ -78,7 +209,7 @@ class PythonFileAnalyzer:
                 'suggestion': 'Break down complex functions into smaller ones'
             })
         elif avg_complexity > 10:
-            self.score -= 15
+            self._penalties.append(15)
             self.warnings.append({
                 'type': 'MODERATE_COMPLEXITY',
                 'severity': 'medium',
@@ -87,7 +218,7 @@ class PythonFileAnalyzer:
                 'suggestion': 'Consider refactoring complex functions'
             })
         elif avg_complexity > 5:
-            self.score -= 5
+            self._penalties.append(5)
             self.info.append({
                 'type': 'MILD_COMPLEXITY',
                 'severity': 'low',
@@ -96,7 +227,7 @@ class PythonFileAnalyzer:
             })
         
         # Check for individual highly complex functions
-        for func in complexity_data['functions']:
+        for func in visitor.functions:
             if func['complexity'] > 20:
                 self.issues.append({
                     'type': 'COMPLEX_FUNCTION',
@@ -106,12 +237,33 @@ class PythonFileAnalyzer:
                     'suggestion': 'Break this function into smaller functions'
                 })
     
-    def _check_code_metrics(self, lines: List[str], tree: ast.AST):
+    def _scan_lines(self, lines: List[str]) -> Dict:
+        """Count comment and blank lines and collect over-long lines."""
+        comment_lines = blank_lines = 0
+        long_lines = []
+        for number, line in enumerate(lines, 1):
+            line = line.rstrip()
+            if not line:
+                blank_lines += 1
+                continue
+            if line.lstrip().startswith('#'):
+                comment_lines += 1
+            if len(line) > 79:
+                long_lines.append((number, len(line)))
+        
+        return {
+            'total_lines': len(lines),
+            'comment_lines': comment_lines,
+            'blank_lines': blank_lines,
+            'long_lines': long_lines,
+        }
+    
+    def _check_code_metrics(self, line_stats: Dict, visitor: 'AnalysisVisitor'):
         """Check documentation and comment ratios."""
-        total_lines = len(lines)
-        docstring_lines = self._count_docstrings(tree)
-        comment_lines = sum(1 for line in lines if line.strip().startswith('#'))
-        blank_lines = sum(1 for line in lines if not line.strip())
+        total_lines = line_stats['total_lines']
+        docstring_lines = visitor.docstring_lines
+        comment_lines = line_stats['comment_lines']
+        blank_lines = line_stats['blank_lines']
         code_lines = total_lines - comment_lines - blank_lines - docstring_lines
         
         if total_lines > 0:
@@ -119,7 +271,7 @@ class PythonFileAnalyzer:
             comment_ratio = comment_lines / total_lines
             
             if docstring_ratio < 0.1:
-                self.score -= 20
+                self._penalties.append(20)
                 self.issues.append({
                     'type': 'LOW_DOCUMENTATION',
                     'severity': 'high',
@@ -128,7 +280,7 @@ class PythonFileAnalyzer:
                     'suggestion': 'Add docstrings to functions and classes'
                 })
             elif docstring_ratio < 0.2:
-                self.score -= 10
+                self._penalties.append(10)
                 self.warnings.append({
                     'type': 'MODERATE_DOCUMENTATION',
                     'severity': 'medium',
@@ -137,7 +289,7 @@ class PythonFileAnalyzer:
                 })
             
             if comment_ratio < 0.05:
-                self.score -= 10
+                self._penalties.append(10)
                 self.warnings.append({
                     'type': 'LOW_COMMENTS',
                     'severity': 'medium',
@@ -146,23 +298,13 @@ class PythonFileAnalyzer:
                     'suggestion': 'Add comments to explain complex logic'
                 })
     
-    def _count_docstrings(self, tree: ast.AST) -> int:
-        """Count docstring lines in the AST."""
-        docstring_count = 0
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Module)):
-                docstring = ast.get_docstring(node)
-                if docstring:
-                    docstring_count += len(docstring.split('\n'))
-        return docstring_count
-    
-    def _check_pep8_style(self, lines: List[str], tree: ast.AST):
+    def _check_pep8_style(self, line_stats: Dict, visitor: 'AnalysisVisitor'):
         """Check PEP 8 style compliance."""
         # Line length
-        long_lines = [(i+1, len(line.rstrip())) for i, line in enumerate(lines) if len(line.rstrip()) > 79]
+        long_lines = line_stats['long_lines']
         if long_lines:
             penalty = min(len(long_lines) * 2, 20)
-            self.score -= penalty
+            self._penalties.append(penalty)
             self.warnings.append({
                 'type': 'LONG_LINES',
                 'severity': 'medium',
@@ -172,88 +314,67 @@ class PythonFileAnalyzer:
             })
         
         # Naming conventions
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                if not re.match(r'^[a-z_][a-z0-9_]*$', node.name) and not node.name.startswith('__'):
-                    self.info.append({
-                        'type': 'NAMING_CONVENTION',
-                        'severity': 'low',
-                        'line': node.lineno,
-                        'message': f"Function '{node.name}' should use snake_case"
-                    })
-            elif isinstance(node, ast.ClassDef):
-                if not re.match(r'^[A-Z][a-zA-Z0-9]*$', node.name):
-                    self.info.append({
-                        'type': 'NAMING_CONVENTION',
-                        'severity': 'low',
-                        'line': node.lineno,
-                        'message': f"Class '{node.name}' should use PascalCase"
-                    })
-    
-    def _check_best_practices(self, tree: ast.AST, content: str):
+        for line, message in visitor.naming:
+            self.info.append({
+                'type': 'NAMING_CONVENTION',
+                'severity': 'low',
+                'line': line,
+                'message': message
+            })
+    
+    def _check_best_practices(self, visitor: 'AnalysisVisitor', content: str):
         """Check Python best practices."""
         # Bare except clauses
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ExceptHandler) and node.type is None:
-                self.score -= 8
-                self.warnings.append({
-                    'type': 'BARE_EXCEPT',
-                    'severity': 'medium',
-                    'line': node.lineno,
-                    'message': 'Bare except clause catches all exceptions',
-                    'penalty': -8,
-                    'suggestion': 'Specify exception type(s) to catch'
-                })
+        for line in visitor.bare_excepts:
+            self._penalties.append(8)
+            self.warnings.append({
+                'type': 'BARE_EXCEPT',
+                'severity': 'medium',
+                'line': line,
+                'message': 'Bare except clause catches all exceptions',
+                'penalty': -8,
+                'suggestion': 'Specify exception type(s) to catch'
+            })
         
         # Mutable default arguments
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                for default in node.args.defaults:
-                    if isinstance(default, (ast.List, ast.Dict, ast.Set)):
-                        self.score -= 15
-                        self.issues.append({
-                            'type': 'MUTABLE_DEFAULT',
-                            'severity': 'high',
-                            'line': node.lineno,
-                            'message': f"Mutable default argument in '{node.name}'",
-                            'penalty': -15,
-                            'suggestion': 'Use None as default and initialize inside function'
-                        })
+        for line, name in visitor.mutable_defaults:
+            self._penalties.append(15)
+            self.issues.append({
+                'type': 'MUTABLE_DEFAULT',
+                'severity': 'high',
+                'line': line,
+                'message': f"Mutable default argument in '{name}'",
+                'penalty': -15,
+                'suggestion': 'Use None as default and initialize inside function'
+            })
         
         # Global variables (non-constants)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Global):
-                for name in node.names:
-                    if not name.isupper():
-                        self.score -= 8
-                        self.warnings.append({
-                            'type': 'GLOBAL_VARIABLE',
-                            'severity': 'medium',
-                            'line': node.lineno,
-                            'message': f"Global variable '{name}' (avoid if possible)",
-                            'penalty': -8
-                        })
+        for line, name in visitor.global_names:
+            self._penalties.append(8)
+            self.warnings.append({
+                'type': 'GLOBAL_VARIABLE',
+                'severity': 'medium',
+                'line': line,
+                'message': f"Global variable '{name}' (avoid if possible)",
+                'penalty': -8
+            })
         
         # Missing docstrings in public functions/classes
-        missing_docstrings = 0
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                if not node.name.startswith('_') and not ast.get_docstring(node):
-                    missing_docstrings += 1
-                    self.info.append({
-                        'type': 'MISSING_DOCSTRING',
-                        'severity': 'low',
-                        'line': node.lineno,
-                        'message': f"Missing docstring in '{node.name}'"
-                    })
+        for line, name in visitor.missing_docstrings:
+            self.info.append({
+                'type': 'MISSING_DOCSTRING',
+                'severity': 'low',
+                'line': line,
+                'message': f"Missing docstring in '{name}'"
+            })
         
-        if missing_docstrings > 0:
-            penalty = min(missing_docstrings * 2, 15)
-            self.score -= penalty
+        if visitor.missing_docstrings:
+            penalty = min(len(visitor.missing_docstrings) * 2, 15)
+            self._penalties.append(penalty)
         
         # Wildcard imports
-        if re.search(r'from .* import \*', content):
-            self.score -= 10
+        if _WILDCARD_IMPORT_RE.search(content):
+            self._penalties.append(10)
             self.warnings.append({
                 'type': 'WILDCARD_IMPORT',
                 'severity': 'medium',
@@ -262,26 +383,23 @@ class PythonFileAnalyzer:
                 'suggestion': 'Import specific names instead'
             })
     
-    def _check_performance(self, tree: ast.AST, content: str):
+    def _check_performance(self, visitor: 'AnalysisVisitor', content: str):
         """Check for performance issues."""
         # String concatenation in loops
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.For, ast.While)):
-                for child in ast.walk(node):
-                    if isinstance(child, ast.AugAssign) and isinstance(child.op, ast.Add):
-                        self.score -= 20
-                        self.issues.append({
-                            'type': 'STRING_CONCAT_LOOP',
-                            'severity': 'high',
-                            'line': child.lineno,
-                            'message': 'String concatenation in loop (slow)',
-                            'penalty': -20,
-                            'suggestion': 'Use join() or list accumulation instead'
-                        })
+        for line in sorted(visitor.string_concat_in_loop):
+            self._penalties.append(20)
+            self.issues.append({
+                'type': 'STRING_CONCAT_LOOP',
+                'severity': 'high',
+                'line': line,
+                'message': 'String concatenation in loop (slow)',
+                'penalty': -20,
+                'suggestion': 'Use join() or list accumulation instead'
+            })
         
         # Inefficient membership testing
-        if re.search(r'\bin\s+\[', content):
-            self.score -= 10
+        if _LIST_MEMBERSHIP_RE.search(content):
+            self._penalties.append(10)
             self.warnings.append({
                 'type': 'LIST_MEMBERSHIP',
                 'severity': 'medium',
@@ -290,11 +408,11 @@ class PythonFileAnalyzer:
                 'suggestion': 'Use set for membership testing'
             })
     
-    def _check_security(self, content: str, lines: List[str]):
+    def _check_security(self, content: str):
         """Check for security issues."""
         # eval() usage
         if 'eval(' in content:
-            self.score -= 25
+            self._penalties.append(25)
             self.issues.append({
                 'type': 'EVAL_USAGE',
                 'severity': 'critical',
@@ -305,7 +423,7 @@ class PythonFileAnalyzer:
         
         # exec() usage
         if 'exec(' in content:
-            self.score -= 25
+            self._penalties.append(25)
             self.issues.append({
                 'type': 'EXEC_USAGE',
                 'severity': 'critical',
@@ -315,8 +433,8 @@ class PythonFileAnalyzer:
             })
         
         # shell=True in subprocess
-        if re.search(r'subprocess\.[^(]*\([^)]*shell\s*=\s*True', content):
-            self.score -= 15
+        if _SHELL_TRUE_RE.search(content):
+            self._penalties.append(15)
             self.issues.append({
                 'type': 'SHELL_INJECTION',
                 'severity': 'high',
@@ -325,22 +443,31 @@ class PythonFileAnalyzer:
                 'suggestion': 'Avoid shell=True or sanitize inputs'
             })
         
-        # Hardcoded secrets
-        for i, line in enumerate(lines, 1):
-            if re.search(r'(password|secret|key|token|api_key)\s*=\s*["\'][^"\'{}$]+["\']', line, re.IGNORECASE):
-                self.score -= 15
+        lowered = content.lower()
+        
+        # Hardcoded secrets: one scan of the whole file, at most one issue
+        # per line
+        line = 1
+        position = 0
+        last_line = 0
+        for match in _HARDCODED_SECRET_RE.finditer(lowered):
+            line += lowered.count('\n', position, match.start())
+            position = match.start()
+            if line != last_line:
+                last_line = line
+                self._penalties.append(15)
                 self.issues.append({
                     'type': 'HARDCODED_SECRET',
                     'severity': 'high',
-                    'line': i,
+                    'line': line,
                     'message': 'Potential hardcoded secret detected',
                     'penalty': -15,
                     'suggestion': 'Use environment variables or secret management'
                 })
         
         # SQL injection risk
-        if re.search(r'(SELECT|INSERT|UPDATE|DELETE).*%', content, re.IGNORECASE):
-            self.score -= 20
+        if _SQL_FORMAT_RE.search(lowered):
+            self._penalties.append(20)
             self.issues.append({
                 'type': 'SQL_INJECTION',
                 'severity': 'high',
@@ -351,7 +478,7 @@ class PythonFileAnalyzer:
     
     def _generate_report(self) -> Dict:
         """Generate the analysis report."""
-        self.score = max(0, self.score)
+        self.score = max(0, 100 - sum(self._penalties))
         
         if self.score >= 90:
             grade = 'A'
@@ -364,6 +491,10 @@ class PythonFileAnalyzer:
         else:
             grade = 'F'
         
+        # One pass per list instead of one comprehension per severity
+        issue_counts = Counter(i.get('severity') for i in self.issues)
+        warning_counts = Counter(i.get('severity') for i in self.warnings)
+        
         return {
             'filepath': str(self.filepath),
             'filename': self.filename,
@@ -373,41 +504,134 @@ class PythonFileAnalyzer:
             'warnings': self.warnings,
             'info': self.info,
             'summary': {
-                'critical_issues': len([i for i in self.issues if i.get('severity') == 'critical']),
-                'high_issues': len([i for i in self.issues if i.get('severity') == 'high']),
-                'medium_issues': len([i for i in self.warnings if i.get('severity') == 'medium']),
+                'critical_issues': issue_counts['critical'],
+                'high_issues': issue_counts['high'],
+                'medium_issues': warning_counts['medium'],
                 'low_issues': len(self.info),
             }
         }
 
 
-class ComplexityAnalyzer(ast.NodeVisitor):
-    """AST visitor to calculate cyclomatic complexity."""
+def _visit_leaf(visitor, node):
+    """AnalysisVisitor handler for nodes without children."""
+
+
+class AnalysisVisitor(ast.NodeVisitor):
+    """AST visitor that collects the data for every AST-based check in one pass.
+    
+    Cyclomatic complexity is tracked for the module and for each function;
+    the other checks only record where they fired, and PythonFileAnalyzer
+    turns those records into issues and penalties.
+    """
     
     def __init__(self):
         self.complexity = 1
         self.functions = []
-        self.current_function = None
-        self.function_complexity = 1
-    
-    def visit_FunctionDef(self, node):
-        self.current_function = node.name
-        self.function_complexity = 1
+        self.docstring_lines = 0
+        self.naming = []
+        self.bare_excepts = []
+        self.mutable_defaults = []
+        self.global_names = []
+        self.missing_docstrings = []
+        self.string_concat_in_loop = set()
+        # Complexity of each enclosing function, innermost last
+        self._function_complexity = []
+        self._loop_depth = 0
+    
+    # Handler for each node type, resolved on first sight rather than by
+    # building and looking up a 'visit_' name for every node
+    _handlers = {}
+    
+    # Fields that can hold child nodes, per node type. 'ctx' is left out:
+    # it only ever holds a Load/Store/Del marker, present on every name,
+    # attribute and subscript, that no check looks at.
+    _child_fields = {}
+    
+    def _handler(self, node_type):
+        """Resolve and cache the handler for one node type."""
+        handler = getattr(type(self), 'visit_' + node_type.__name__, None)
+        if handler is None or handler is ast.NodeVisitor.visit_Constant:
+            if node_type in _LEAF_TYPES:
+                handler = _visit_leaf
+            else:
+                # NodeVisitor.visit_Constant only forwards to the deprecated
+                # visit_Num/visit_Str handlers, none of which exist here
+                handler = type(self).generic_visit
+        self._handlers[node_type] = handler
+        return handler
+    
+    def visit(self, node):
+        node_type = type(node)
+        handler = self._handlers.get(node_type) or self._handler(node_type)
+        return handler(self, node)
+    
+    def generic_visit(self, node):
+        """Visit the child nodes, reading each node's fields directly.
+        
+        Children are dispatched here rather than through visit(), which
+        saves a call per node.
+        """
+        node_type = type(node)
+        fields = self._child_fields.get(node_type)
+        if fields is None:
+            fields = tuple(field for field in node_type._fields if field != 'ctx')
+            self._child_fields[node_type] = fields
+        
+        handlers = self._handlers
+        for field in fields:
+            value = getattr(node, field, None)
+            if type(value) is list:
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        item_type = type(item)
+                        (handlers.get(item_type) or self._handler(item_type))(self, item)
+            elif isinstance(value, ast.AST):
+                value_type = type(value)
+                (handlers.get(value_type) or self._handler(value_type))(self, value)
+    
+    def _check_docstring(self, node):
+        docstring = ast.get_docstring(node)
+        if docstring:
+            self.docstring_lines += docstring.count('\n') + 1
+        elif type(node) is not ast.Module and not node.name.startswith('_'):
+            self.missing_docstrings.append((node.lineno, node.name))
+    
+    def _visit_function(self, node):
+        self._check_docstring(node)
+        for default in node.args.defaults:
+            if type(default) in _MUTABLE_DEFAULT_TYPES:
+                self.mutable_defaults.append((node.lineno, node.name))
+        
+        self._function_complexity.append(1)
         self.generic_visit(node)
         self.functions.append({
             'name': node.name,
-            'complexity': self.function_complexity,
+            'complexity': self._function_complexity.pop(),
             'line': node.lineno
         })
-        self.current_function = None
+    
+    def _increment_complexity(self, increment=1):
+        self.complexity += increment
+        if self._function_complexity:
+            self._function_complexity[-1] += increment
+    
+    def visit_Module(self, node):
+        self._check_docstring(node)
+        self.generic_visit(node)
+    
+    def visit_FunctionDef(self, node):
+        if not _SNAKE_CASE_RE.match(node.name) and not node.name.startswith('__'):
+            self.naming.append((node.lineno, f"Function '{node.name}' should use snake_case"))
+        self._visit_function(node)
     
     def visit_AsyncFunctionDef(self, node):
-        self.visit_FunctionDef(node)
+        self._visit_function(node)
     
-    def _increment_complexity(self):
-        self.complexity += 1
-        if self.current_function:
-            self.function_complexity += 1
+    def visit_ClassDef(self, node):
+        if not _PASCAL_CASE_RE.match(node.name):
+            self.naming.append((node.lineno, f"Class '{node.name}' should use PascalCase"))
+        self._check_docstring(node)
+        self.generic_visit(node)
     
     def visit_If(self, node):
         self._increment_complexity()
@@ -415,14 +639,20 @@ class ComplexityAnalyzer(ast.NodeVisitor):
     
     def visit_For(self, node):
         self._increment_complexity()
+        self._loop_depth += 1
         self.generic_visit(node)
+        self._loop_depth -= 1
     
     def visit_While(self, node):
         self._increment_complexity()
+        self._loop_depth += 1
         self.generic_visit(node)
+        self._loop_depth -= 1
     
     def visit_ExceptHandler(self, node):
         self._increment_complexity()
+        if node.type is None:
+            self.bare_excepts.append(node.lineno)
         self.generic_visit(node)
     
     def visit_With(self, node):
@@ -431,82 +661,181 @@ class ComplexityAnalyzer(ast.NodeVisitor):
     
     def visit_BoolOp(self, node):
         if isinstance(node.op, (ast.And, ast.Or)):
-            increment = len(node.values) - 1
-            self.complexity += increment
-            if self.current_function:
-                self.function_complexity += increment
+            self._increment_complexity(len(node.values) - 1)
         self.generic_visit(node)
     
-    def get_complexity(self):
-        return {
-            'total_complexity': self.complexity,
-            'functions': self.functions
-        }
+    def visit_Global(self, node):
+        for name in node.names:
+            if not name.isupper():
+                self.global_names.append((node.lineno, name))
+    
+    def visit_AugAssign(self, node):
+        if self._loop_depth and type(node.op) is ast.Add:
+            self.string_concat_in_loop.add(node.lineno)
+        self.generic_visit(node)
 
 
-def format_text_report(report: Dict) -> str:
-    """Format the report as human-readable text."""
-    output = []
-    output.append("=" * 70)
-    output.append("PYTHON QUALITY ANALYSIS REPORT")
-    output.append("=" * 70)
-    output.append(f"File: {report['filename']}")
-    output.append(f"Score: {report['overall_score']}/100 (Grade: {report['grade']})")
-    output.append("-" * 70)
+def dump_json(report: Union[Dict, List[Dict]]) -> bytes:
+    """Serialize a report as indented JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2)
+    return json.dumps(report, indent=2).encode()
+
+
+def _iter_text_report(report: Dict) -> Iterator[str]:
+    """Yield the human-readable report one newline-terminated line at a time."""
+    yield "=" * 70 + "\n"
+    yield "PYTHON QUALITY ANALYSIS REPORT\n"
+    yield "=" * 70 + "\n"
+    yield f"File: {report['filename']}\n"
+    yield f"Score: {report['overall_score']}/100 (Grade: {report['grade']})\n"
+    if 'note' in report:
+        yield f"Note: {report['note']}\n"
+    yield "-" * 70 + "\n"
     
     summary = report['summary']
-    output.append("Summary:")
-    output.append(f"  Critical Issues: {summary['critical_issues']}")
-    output.append(f"  High Issues: {summary['high_issues']}")
-    output.append(f"  Medium Issues: {summary['medium_issues']}")
-    output.append(f"  Low Issues: {summary['low_issues']}")
-    output.append("-" * 70)
+    yield "Summary:\n"
+    yield f"  Critical Issues: {summary['critical_issues']}\n"
+    yield f"  High Issues: {summary['high_issues']}\n"
+    yield f"  Medium Issues: {summary['medium_issues']}\n"
+    yield f"  Low Issues: {summary['low_issues']}\n"
+    yield "-" * 70 + "\n"
     
     if report['issues']:
-        output.append("\n🔴 ISSUES:")
+        yield "\n🔴 ISSUES:\n"
         for issue in report['issues']:
-            output.append(f"\n  [{issue['severity'].upper()}] {issue['type']}")
+            yield f"\n  [{issue['severity'].upper()}] {issue['type']}\n"
             if 'line' in issue:
-                output.append(f"  Line: {issue['line']}")
-            output.append(f"  Problem: {issue['message']}")
+                yield f"  Line: {issue['line']}\n"
+            yield f"  Problem: {issue['message']}\n"
             if 'penalty' in issue:
-                output.append(f"  Penalty: {issue['penalty']} points")
+                yield f"  Penalty: {issue['penalty']} points\n"
             if 'suggestion' in issue:
-                output.append(f"  💡 {issue['suggestion']}")
+                yield f"  💡 {issue['suggestion']}\n"
     
     if report['warnings']:
-        output.append("\n⚠️  WARNINGS:")
+        yield "\n⚠️  WARNINGS:\n"
         for warning in report['warnings']:
-            output.append(f"\n  [{warning.get('severity', 'medium').upper()}] {warning['type']}")
+            yield f"\n  [{warning.get('severity', 'medium').upper()}] {warning['type']}\n"
             if 'line' in warning:
-                output.append(f"  Line: {warning['line']}")
-            output.append(f"  Problem: {warning['message']}")
+                yield f"  Line: {warning['line']}\n"
+            yield f"  Problem: {warning['message']}\n"
             if 'penalty' in warning:
-                output.append(f"  Penalty: {warning['penalty']} points")
+                yield f"  Penalty: {warning['penalty']} points\n"
             if 'suggestion' in warning:
-                output.append(f"  💡 {warning['suggestion']}")
+                yield f"  💡 {warning['suggestion']}\n"
     
     if not report['issues'] and not report['warnings']:
-        output.append("\n✅ No critical issues found! Good Python quality!")
+        yield "\n✅ No critical issues found! Good Python quality!\n"
+    
+    yield "\n" + "=" * 70 + "\n"
+
+
+def format_text_report(report: Dict) -> str:
+    """Format the report as human-readable text."""
+    return "".join(_iter_text_report(report))
+
+
+def _read_source(filepath: str) -> Tuple[str, Optional[str]]:
+    """Read one file for _analyze_one; None leaves the read to the analyzer."""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return filepath, f.read()
+    except (OSError, UnicodeDecodeError):
+        # analyze() reads the file again and reports the error
+        return filepath, None
+
+
+def _analyze_one(cache_dir: Optional[str], source: Tuple[str, Optional[str]]) -> Dict:
+    """Analyze one prefetched file; module-level so worker processes can run it."""
+    filepath, content = source
+    return PythonFileAnalyzer(filepath, cache_dir=cache_dir).analyze(content)
+
+
+def _run_batch(args) -> int:
+    """Analyze every file named in the --batch list; return the exit code."""
+    if args.batch == '-':
+        paths = [line.strip() for line in sys.stdin]
+    else:
+        with open(args.batch, 'r', encoding='utf-8') as f:
+            paths = [line.strip() for line in f]
+    paths = [path for path in paths if path]
+    
+    # One interpreter start-up for the whole list, with the files spread
+    # over worker processes; chunks cut the per-file IPC round trips.
+    # Reads block outside the GIL, so a thread pool keeps several in
+    # flight and feeds the workers while they analyze earlier files.
+    with ThreadPoolExecutor(max_workers=8) as readers, \
+            ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        sources = readers.map(_read_source, paths)
+        worker = functools.partial(_analyze_one, args.cache_dir)
+        reports = list(executor.map(worker, sources, chunksize=16))
+    
+    json_filename = args.output_json or 'python_quality_reports.json'
+    with open(json_filename, 'wb') as f:
+        f.write(dump_json(reports))
+    print(f"JSON report saved to: {json_filename}")
+    
+    text_filename = args.output_text or 'python_quality_reports.txt'
+    with open(text_filename, 'w') as f:
+        for report in reports:
+            if 'error' not in report:
+                f.writelines(_iter_text_report(report))
+    print(f"Text report saved to: {text_filename}")
+    
+    exit_code = 0
+    for report in reports:
+        if 'error' in report:
+            print(f"Error analyzing {report['filepath']}: {report['error']}", file=sys.stderr)
+            exit_code = 1
+        else:
+            print(f"{report['filepath']}: {report['overall_score']}/100 (Grade: {report['grade']})")
+            if report['overall_score'] < 70:
+                exit_code = 1
     
-    output.append("\n" + "=" * 70)
-    return "\n".join(output)
+    return exit_code
 
 
 def main():
     parser = argparse.ArgumentParser(description='Analyze Python file quality')
-    parser.add_argument('filepath', help='Path to Python file to analyze')
+    parser.add_argument('filepath', nargs='?',
+                        help='Path to Python file to analyze (with --stdin, the name to report)')
     parser.add_argument('--output-json', help='Output JSON report to file')
     parser.add_argument('--output-text', help='Output text report to file')
+    parser.add_argument('--batch', metavar='FILE_LIST',
+                        help='Analyze every file listed in FILE_LIST, one path per line '
+                             '("-" reads the list from stdin)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Worker processes for --batch (default: one per CPU)')
+    parser.add_argument('--cache-dir',
+                        help='Reuse reports stored here for files whose contents are unchanged')
+    parser.add_argument('--stdin', action='store_true',
+                        help='Read the source to analyze from stdin instead of from filepath')
     
     args = parser.parse_args()
     
-    if not Path(args.filepath).exists():
-        print(f"Error: File not found: {args.filepath}", file=sys.stderr)
-        sys.exit(1)
+    if args.cache_dir:
+        os.makedirs(args.cache_dir, exist_ok=True)
+    
+    if args.batch:
+        sys.exit(_run_batch(args))
+    
+    if args.stdin:
+        analyzer = PythonFileAnalyzer.from_string(
+            sys.stdin.read(), args.filepath or '<stdin>', cache_dir=args.cache_dir)
+        stem = Path(args.filepath).stem if args.filepath else 'stdin'
+    else:
+        if args.filepath is None:
+            parser.error('a filepath, --stdin or --batch is required')
+        
+        if not Path(args.filepath).exists():
+            print(f"Error: File not found: {args.filepath}", file=sys.stderr)
+            sys.exit(1)
+        
+        analyzer = PythonFileAnalyzer(args.filepath, cache_dir=args.cache_dir)
+        stem = Path(args.filepath).stem
     
     # Run analysis
-    analyzer = PythonFileAnalyzer(args.filepath)
     report = analyzer.analyze()
     
     # Check for errors
@@ -515,20 +844,19 @@ def main():
         sys.exit(1)
     
     # Output JSON report
-    json_filename = args.output_json or f"{Path(args.filepath).stem}_quality_report.json"
-    with open(json_filename, 'w') as f:
-        json.dump(report, f, indent=2)
+    json_filename = args.output_json or f"{stem}_quality_report.json"
+    with open(json_filename, 'wb') as f:
+        f.write(dump_json(report))
     print(f"JSON report saved to: {json_filename}")
     
     # Output text report
-    text_report = format_text_report(report)
-    text_filename = args.output_text or f"{Path(args.filepath).stem}_quality_report.txt"
+    text_filename = args.output_text or f"{stem}_quality_report.txt"
     with open(text_filename, 'w') as f:
-        f.write(text_report)
+        f.writelines(_iter_text_report(report))
     print(f"Text report saved to: {text_filename}")
     
     # Print to console
-    print(text_report)
+    sys.stdout.writelines(_iter_text_report(report))
     
     # Exit with error code if score is too low
     if report['overall_score'] < 70:
@@ -2,52 +2,476 @@
 
 import argparse
 import ast
+import functools
+import hashlib
+import inspect
 import json
 import os
+import pickle
 import re
 import sys
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
 from pathlib import Path
-from typing import Dict, List, Any, Set
+from typing import Dict, List, Any, Optional, Set, Tuple
 import subprocess
 
 
+# Cached trees are only valid for the interpreter that parsed them; the AST
+# node classes change between Python versions
+_AST_CACHE_TAG = 'py{}{}'.format(*sys.version_info[:2])
+
+# Naming conventions
+_SNAKE_CASE_RE = re.compile(r'^[a-z_][a-z0-9_]*$')
+_PASCAL_CASE_RE = re.compile(r'^[A-Z][a-zA-Z0-9]*$')
+
+# Source-level checks
+_WILDCARD_IMPORT_RE = re.compile(r'from .* import \*')
+_TODO_RE = re.compile(r'#.*\b(TODO|FIXME|XXX)\b', re.IGNORECASE)
+_APPEND_IN_LOOP_RE = re.compile(r'for .+ in .+:\s*\n\s*\w+\.append\(')
+_LIST_MEMBERSHIP_RE = re.compile(r'\bin\s+\[.*\]')
+_SHELL_TRUE_RE = re.compile(r'subprocess\.[^(]*\([^)]*shell\s*=\s*True')
+# Whole-file patterns whose matches never cross a line break; their lines
+# are found from the match offsets. The secret pattern is matched against
+# the lowercased file, as a literal alternation is far cheaper for the
+# regex engine to find than an IGNORECASE one.
+_HARDCODED_SECRET_RE = re.compile(r'(password|secret|key|token)[^\S\n]*=[^\S\n]*["\'](?!.*\{|\$)')
+_HARDCODED_SECRET_ANY_CASE_RE = re.compile(_HARDCODED_SECRET_RE.pattern, re.IGNORECASE)
+_SQL_FORMAT_RE = re.compile(r'(SELECT|INSERT|UPDATE|DELETE).*%.*', re.IGNORECASE)
+
+# Calls reported once per file by the security check, keyed as in
+# UnifiedAnalyzer.risky_calls: eval(), exec() and subprocess with shell=True
+_RISKY_CALLS = (
+    ('eval', 'Use of eval() function (security risk)', 'high'),
+    ('exec', 'Use of exec() function (security risk)', 'high'),
+    ('shell', 'subprocess with shell=True (command injection risk)', 'medium'),
+)
+
+# Node types that never have child nodes worth visiting (a Name's only
+# child is its ctx marker, an alias only holds names). Operators and other
+# types without fields are leaves as well.
+_LEAF_TYPES = frozenset({ast.Name, ast.Constant, ast.alias})
+
+# How the missing-docstring check names each kind of definition
+_NODE_KIND_NAME = {
+    ast.FunctionDef: 'function',
+    ast.AsyncFunctionDef: 'asyncfunction',
+    ast.ClassDef: 'class',
+}
+
+# Python standard library modules: the interpreter's complete list where
+# it has one (3.10+), otherwise the most common modules
+_STDLIB_MODULES = frozenset(getattr(sys, 'stdlib_module_names', None) or {
+    'os', 'sys', 'json', 're', 'math', 'random', 'datetime', 'time',
+    'pathlib', 'collections', 'itertools', 'functools', 'typing',
+    'unittest', 'logging', 'argparse', 'subprocess', 'threading',
+    'multiprocessing', 'asyncio', 'ast', 'inspect', 'pickle', 'csv'
+})
+
+
+def _parse(content: str, py_file: Path, cache_dir: Optional[Path]) -> Tuple[ast.AST, Optional[bool]]:
+    """Parse a source, reusing the pickled tree from cache_dir when there is one.
+    
+    Returns the tree and whether it came from the cache (None without a
+    cache). Entries are keyed by a SHA-256 of the source and the Python
+    version, so a changed file or interpreter simply misses. A tree that
+    cannot be stored (nested too deeply to pickle, or an unwritable
+    directory) is returned uncached.
+    
+    Loading an entry unpickles it, which can run arbitrary code: cache_dir
+    must be as trusted as the scripts themselves, never a location that
+    untrusted jobs or pull requests can write to.
+    """
+    if cache_dir is None:
+        return ast.parse(content, filename=str(py_file)), None
+    
+    key = hashlib.sha256(content.encode()).hexdigest()
+    cache_file = cache_dir / f"{key}-{_AST_CACHE_TAG}.pkl"
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f), True
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+    
+    tree = ast.parse(content, filename=str(py_file))
+    # Write then rename so concurrent workers never read a partial entry
+    tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+    try:
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(tree, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except (RecursionError, pickle.PicklingError, OSError):
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
+    return tree, False
+
+
+def _analyze_one(source_dir: Path, cache_dir: Optional[Path], py_file: Path) -> Dict:
+    """Read and parse one file once and run every per-file check on it.
+    
+    Files that do not parse, or are nested too deeply to analyze, get only
+    the text-based style and security checks, plus an error entry in the
+    complexity results; the AST-based results are None for them.
+    """
+    # One read and one decode; newlines are then translated the way text
+    # mode would
+    content = py_file.read_bytes().decode('utf-8', errors='ignore')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    
+    # The file's lines without line endings, as readlines() would split them
+    lines = content.split('\n')
+    if not lines[-1]:
+        lines.pop()  # the empty text after a final newline
+    # Offset of the start of each line, and of the end of the last one
+    line_starts = list(accumulate((len(line) + 1 for line in lines), initial=0))
+    
+    file_path = str(py_file.relative_to(source_dir))
+    try:
+        tree, cache_hit = _parse(content, py_file, cache_dir)
+        # One traversal collects what every AST-based check needs
+        try:
+            visitor = UnifiedAnalyzer(file_path)
+            visitor.visit(tree)
+        except RecursionError:
+            # An expression nested deeper than the recursion limit; start
+            # over with the walker that expands such nodes without recursing
+            visitor = IterativeAnalyzer(file_path)
+            visitor.visit(tree)
+    except (SyntaxError, RecursionError, MemoryError) as e:
+        # Source nested too deeply for the parser (which raises
+        # RecursionError or MemoryError) or for the fallback walk; report it
+        # against this file rather than failing the run
+        return {
+            'file': file_path,
+            'complexity': {
+                'file': file_path,
+                'error': str(e),
+                'complexity': 0,
+                'functions': 0,
+                'classes': 0
+            },
+            'metrics': None,
+            'style': _check_pep8_style(content, lines, None, file_path),
+            'best_practices': None,
+            'performance': None,
+            'imports': None,
+            'security': _check_security(content, line_starts, None, file_path),
+            'cache_hit': None,
+        }
+    
+    return {
+        'file': file_path,
+        'complexity': _check_complexity(visitor, file_path),
+        'metrics': _count_lines(lines, visitor),
+        'style': _check_pep8_style(content, lines, visitor, file_path),
+        'best_practices': _check_best_practices(content, line_starts, visitor, file_path),
+        'performance': _check_performance(content, line_starts, visitor, file_path),
+        'imports': _check_imports(visitor),
+        'security': _check_security(content, line_starts, visitor, file_path),
+        'cache_hit': cache_hit,
+    }
+
+
+def _match_lines(pattern: re.Pattern, content: str, line_starts: List[int]) -> List[int]:
+    """Line numbers, in order and without repeats, of the lines pattern matches in content."""
+    match_lines = []
+    for match in pattern.finditer(content):
+        i = bisect_right(line_starts, match.start())
+        if not match_lines or match_lines[-1] != i:
+            match_lines.append(i)
+    return match_lines
+
+
+def _check_complexity(visitor: 'UnifiedAnalyzer', file_path: str) -> Dict:
+    """Cyclomatic complexity of one parsed file."""
+    file_complexity = visitor.get_complexity()
+    # Sorted most complex first, so the maximum is the first entry
+    functions = file_complexity['functions']
+    return {
+        'file': file_path,
+        'complexity': file_complexity['total_complexity'],
+        'functions': len(functions),
+        'classes': len(file_complexity['classes']),
+        'max_function_complexity': functions[0]['complexity'] if functions else 0,
+        'function_details': functions[:5]  # Top 5 most complex functions
+    }
+
+
+def _count_lines(lines: List[str], visitor: 'UnifiedAnalyzer') -> tuple:
+    """Count different types of lines using both text analysis and AST."""
+    loc = 0
+    comments = 0
+    blank = 0
+    docstrings = 0
+    
+    in_multiline_string = False
+    quote_type = None
+    
+    # Docstring line numbers and import count from the AST
+    docstring_lines = visitor.docstring_lines
+    imports = visitor.import_count
+    
+    # Count line types
+    for i, line in enumerate(lines, 1):
+        stripped = line.strip()
+        
+        if not stripped:
+            blank += 1
+        elif i in docstring_lines:
+            docstrings += 1
+        elif stripped.startswith('#'):
+            comments += 1
+        elif '"""' in stripped or "'''" in stripped:
+            if not in_multiline_string:
+                # Check if it's a single-line triple quote
+                triple_count = stripped.count('"""') + stripped.count("'''")
+                if triple_count >= 2:
+                    # Single line docstring/comment
+                    if i in docstring_lines:
+                        docstrings += 1
+                    else:
+                        comments += 1
+                else:
+                    in_multiline_string = True
+                    quote_type = '"""' if '"""' in stripped else "'''"
+                    if i in docstring_lines:
+                        docstrings += 1
+                    else:
+                        comments += 1
+            else:
+                if quote_type in stripped:
+                    in_multiline_string = False
+                if i in docstring_lines:
+                    docstrings += 1
+                else:
+                    comments += 1
+        elif in_multiline_string:
+            if i in docstring_lines:
+                docstrings += 1
+            else:
+                comments += 1
+        else:
+            loc += 1
+    
+    return loc, comments, blank, docstrings, imports
+
+
+def _check_pep8_style(content: str, lines: List[str], visitor: Optional['UnifiedAnalyzer'],
+                      file_path: str) -> List[Dict]:
+    """PEP 8 style issues for one file; the naming checks need a parsed tree."""
+    # Check line length (PEP 8: max 79 characters); a line no longer than
+    # that before stripping cannot be too long after it
+    style_issues = [{
+        'file': file_path,
+        'line': i,
+        'issue': f'Line too long ({len(line.rstrip())} > 79 characters)',
+        'severity': 'warning'
+    } for i, line in enumerate(lines, 1) if len(line) > 79 and len(line.rstrip()) > 79]
+    
+    # Check for wildcard imports
+    if _WILDCARD_IMPORT_RE.search(content):
+        style_issues.append({
+            'file': file_path,
+            'issue': 'Wildcard import found (avoid from module import *)',
+            'severity': 'warning'
+        })
+    
+    if visitor is not None:
+        # Check for unused imports: bound names never referenced as a name
+        # or attribute anywhere in the file
+        used_names = visitor.used_names
+        style_issues.extend({
+            'file': file_path,
+            'line': line,
+            'issue': f'Potentially unused import: {name}',
+            'severity': 'info'
+        } for line, name in visitor.imported_names if name not in used_names)
+    
+    # Check function/class naming conventions
+    if visitor is not None:
+        style_issues.extend(visitor.naming_issues)
+    
+    return style_issues
+
+
+def _check_best_practices(content: str, line_starts: List[int], visitor: 'UnifiedAnalyzer',
+                          file_path: str) -> List[Dict]:
+    """Best-practice issues for one parsed file."""
+    # Bare excepts, mutable defaults, globals and missing docstrings, in
+    # that order, from the AST
+    issues = (visitor.bare_excepts + visitor.mutable_defaults
+              + visitor.global_names + visitor.missing_docstrings)
+    
+    # Check for TODO/FIXME comments
+    issues.extend({
+        'file': file_path,
+        'line': i,
+        'issue': 'TODO/FIXME comment found',
+        'severity': 'info'
+    } for i in _match_lines(_TODO_RE, content, line_starts))
+    
+    return issues
+
+
+def _check_performance(content: str, line_starts: List[int], visitor: 'UnifiedAnalyzer',
+                       file_path: str) -> List[Dict]:
+    """Performance issues for one parsed file."""
+    # Check for string concatenation in loops
+    performance_issues = list(visitor.loop_concats)
+    
+    # Check for inefficient list operations: list.append() in loops when
+    # list comprehension could be used. Every line whose window, from the
+    # line before it to two lines after, holds both the loop header and
+    # the append is reported.
+    flagged = set()
+    pos = 0
+    while True:
+        match = _APPEND_IN_LOOP_RE.search(content, pos)
+        if match is None:
+            break
+        for_line = bisect_right(line_starts, match.start())
+        append_line = bisect_right(line_starts, match.end() - 1)
+        if append_line - for_line <= 3:
+            flagged.update(range(max(1, append_line - 2), for_line + 2))
+        # The append's line may itself end with another loop header
+        pos = line_starts[append_line - 1]
+    for i in sorted(flagged):
+        performance_issues.append({
+            'file': file_path,
+            'line': i,
+            'issue': 'Consider using list comprehension instead of append in loop',
+            'impact': 'medium'
+        })
+    
+    # Check for repeated computation
+    performance_issues.extend(visitor.loop_calls)
+    
+    # Check for inefficient membership testing
+    if _LIST_MEMBERSHIP_RE.search(content):
+        performance_issues.append({
+            'file': file_path,
+            'issue': 'Membership test on list (consider using set)',
+            'impact': 'medium'
+        })
+    
+    return performance_issues
+
+
+def _check_imports(visitor: 'UnifiedAnalyzer') -> Tuple[List[str], List[str], List[str], List[str]]:
+    """Return (imported modules, stdlib, third-party, local) for one parsed file."""
+    file_imports = []
+    buckets = {'stdlib': [], 'third_party': [], 'local': []}
+    
+    for module, is_relative in visitor.imported_modules:
+        file_imports.append(module)
+        buckets[_classify_import(module, is_relative)].append(module)
+    
+    return list(set(file_imports)), buckets['stdlib'], buckets['third_party'], buckets['local']
+
+
+def _classify_import(module: str, is_relative: bool) -> str:
+    """'local', 'stdlib' or 'third_party' for an imported top-level module."""
+    if is_relative or module.startswith('.'):
+        return 'local'
+    if module in _STDLIB_MODULES:
+        return 'stdlib'
+    return 'third_party'
+
+
+def _check_security(content: str, line_starts: List[int], visitor: Optional['UnifiedAnalyzer'],
+                    file_path: str) -> List[Dict]:
+    """Security issues for one file.
+    
+    Dangerous calls are found in the AST, where they have line numbers and
+    strings, comments or methods such as obj.eval() cannot trigger them.
+    Files that do not parse fall back to searching the text.
+    """
+    security_issues = []
+    
+    if visitor is not None:
+        risky_calls = visitor.risky_calls
+    else:
+        risky_calls = {}
+        if 'eval(' in content:
+            risky_calls['eval'] = None
+        if 'exec(' in content:
+            risky_calls['exec'] = None
+        if _SHELL_TRUE_RE.search(content):
+            risky_calls['shell'] = None
+    
+    for call, issue, severity in _RISKY_CALLS:
+        if call in risky_calls:
+            security_issue = {'file': file_path}
+            if risky_calls[call] is not None:
+                security_issue['line'] = risky_calls[call]
+            security_issue['issue'] = issue
+            security_issue['severity'] = severity
+            security_issues.append(security_issue)
+    
+    # Check for hardcoded passwords/secrets
+    lowered = content.lower()
+    if len(lowered) == len(content):
+        secret_lines = _match_lines(_HARDCODED_SECRET_RE, lowered, line_starts)
+    else:
+        # Lowercasing changed the length of some characters, so offsets
+        # into the lowered text would not map back to lines
+        secret_lines = _match_lines(_HARDCODED_SECRET_ANY_CASE_RE, content, line_starts)
+    for i in secret_lines:
+        security_issues.append({
+            'file': file_path,
+            'line': i,
+            'issue': 'Potential hardcoded secret',
+            'severity': 'medium'
+        })
+    
+    # Check for SQL string formatting
+    if _SQL_FORMAT_RE.search(content):
+        security_issues.append({
+            'file': file_path,
+            'issue': 'Potential SQL injection vulnerability (use parameterized queries)',
+            'severity': 'high'
+        })
+    
+    return security_issues
+
+
 class PythonAnalyzer:
-    def __init__(self, source_dir: str):
+    def __init__(self, source_dir: str, max_workers: Optional[int] = None,
+                 cache_dir: Optional[str] = None):
         self.source_dir = Path(source_dir)
+        self.max_workers = max_workers
+        self.cache_dir = Path(cache_dir) if cache_dir else None
         self.metrics = {}
-        self.python_files = list(self.source_dir.rglob("*.py"))
+        self.python_files = self._collect()
+        self._results = None
+    
+    def _collect(self) -> List[Path]:
+        """Walk the source tree once for .py files, without a stat per entry."""
+        python_files = []
+        for dirpath, _, filenames in os.walk(self.source_dir):
+            directory = Path(dirpath)
+            for filename in filenames:
+                if filename.endswith('.py'):
+                    python_files.append(directory / filename)
+        return python_files
+    
+    def _scan(self) -> List[Dict]:
+        """Analyze every file once, in parallel, and cache the results."""
+        if self._results is None:
+            if self.cache_dir is not None:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+            worker = functools.partial(_analyze_one, self.source_dir, self.cache_dir)
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                self._results = list(executor.map(worker, self.python_files, chunksize=16))
+        return self._results
     
     def analyze_complexity(self) -> Dict:
         """Analyze cyclomatic complexity of Python code using AST."""
-        complexity_scores = []
-        
-        for py_file in self.python_files:
-            try:
-                with open(py_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                
-                tree = ast.parse(content, filename=str(py_file))
-                analyzer = ComplexityAnalyzer()
-                analyzer.visit(tree)
-                
-                file_complexity = analyzer.get_complexity()
-                complexity_scores.append({
-                    'file': str(py_file.relative_to(self.source_dir)),
-                    'complexity': file_complexity['total_complexity'],
-                    'functions': len(file_complexity['functions']),
-                    'classes': len(file_complexity['classes']),
-                    'max_function_complexity': max([f['complexity'] for f in file_complexity['functions']], default=0),
-                    'function_details': file_complexity['functions'][:5]  # Top 5 most complex functions
-                })
-                
-            except (SyntaxError, UnicodeDecodeError) as e:
-                complexity_scores.append({
-                    'file': str(py_file.relative_to(self.source_dir)),
-                    'error': str(e),
-                    'complexity': 0,
-                    'functions': 0,
-                    'classes': 0
-                })
+        complexity_scores = [result['complexity'] for result in self._scan()]
         
         valid_scores = [f for f in complexity_scores if 'error' not in f]
         avg_complexity = sum(f['complexity'] for f in valid_scores) / len(valid_scores) if valid_scores else 0
@@ -69,27 +493,18 @@ class PythonAnalyzer:
         total_imports = 0
         file_count = 0
         
-        for py_file in self.python_files:
+        for result in self._scan():
+            if result['metrics'] is None:
+                continue  # Don't count unparseable files
             file_count += 1
-            try:
-                with open(py_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    content = ''.join(lines)
-                
-                # Parse AST for more accurate metrics
-                tree = ast.parse(content)
-                
-                loc, comments, blank, docstrings, imports = self._count_lines(lines, tree)
-                
-                total_loc += loc
-                total_comments += comments
-                total_blank += blank
-                total_docstrings += docstrings
-                total_imports += imports
-                
-            except (SyntaxError, UnicodeDecodeError):
-                file_count -= 1  # Don't count unparseable files
-                continue
+            
+            loc, comments, blank, docstrings, imports = result['metrics']
+            
+            total_loc += loc
+            total_comments += comments
+            total_blank += blank
+            total_docstrings += docstrings
+            total_imports += imports
         
         total_lines = total_loc + total_comments + total_blank
         
@@ -106,145 +521,9 @@ class PythonAnalyzer:
             'avg_loc_per_file': total_loc / file_count if file_count > 0 else 0
         }
     
-    def _count_lines(self, lines: List[str], tree: ast.AST) -> tuple:
-        """Count different types of lines using both text analysis and AST."""
-        loc = 0
-        comments = 0
-        blank = 0
-        docstrings = 0
-        imports = 0
-        
-        in_multiline_string = False
-        quote_type = None
-        
-        # Get docstring line numbers from AST
-        docstring_lines = set()
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Module)):
-                if (ast.get_docstring(node) and hasattr(node, 'body') and 
-                    node.body and isinstance(node.body[0], ast.Expr) and 
-                    isinstance(node.body[0].value, ast.Constant)):
-                    start_line = node.body[0].lineno
-                    end_line = getattr(node.body[0], 'end_lineno', start_line)
-                    if end_line:
-                        docstring_lines.update(range(start_line, end_line + 1))
-        
-        # Count imports from AST
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.Import, ast.ImportFrom)):
-                imports += 1
-        
-        # Count line types
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-            
-            if not stripped:
-                blank += 1
-            elif i in docstring_lines:
-                docstrings += 1
-            elif stripped.startswith('#'):
-                comments += 1
-            elif '"""' in stripped or "'''" in stripped:
-                if not in_multiline_string:
-                    # Check if it's a single-line triple quote
-                    triple_count = stripped.count('"""') + stripped.count("'''")
-                    if triple_count >= 2:
-                        # Single line docstring/comment
-                        if i in docstring_lines:
-                            docstrings += 1
-                        else:
-                            comments += 1
-                    else:
-                        in_multiline_string = True
-                        quote_type = '"""' if '"""' in stripped else "'''"
-                        if i in docstring_lines:
-                            docstrings += 1
-                        else:
-                            comments += 1
-                else:
-                    if quote_type in stripped:
-                        in_multiline_string = False
-                    if i in docstring_lines:
-                        docstrings += 1
-                    else:
-                        comments += 1
-            elif in_multiline_string:
-                if i in docstring_lines:
-                    docstrings += 1
-                else:
-                    comments += 1
-            else:
-                loc += 1
-        
-        return loc, comments, blank, docstrings, imports
-    
     def check_pep8_style(self) -> Dict:
         """Check PEP 8 style compliance."""
-        style_issues = []
-        
-        for py_file in self.python_files:
-            try:
-                with open(py_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    content = ''.join(lines)
-                
-                file_path = str(py_file.relative_to(self.source_dir))
-                
-                # Check line length (PEP 8: max 79 characters)
-                for i, line in enumerate(lines, 1):
-                    if len(line.rstrip()) > 79:
-                        style_issues.append({
-                            'file': file_path,
-                            'line': i,
-                            'issue': f'Line too long ({len(line.rstrip())} > 79 characters)',
-                            'severity': 'warning'
-                        })
-                
-                # Check for wildcard imports
-                if re.search(r'from .* import \*', content):
-                    style_issues.append({
-                        'file': file_path,
-                        'issue': 'Wildcard import found (avoid from module import *)',
-                        'severity': 'warning'
-                    })
-                
-                # Check for unused imports (basic check)
-                imports = re.findall(r'^(?:from .+ )?import (.+)', content, re.MULTILINE)
-                for import_line in imports:
-                    imported_names = [name.strip() for name in import_line.split(',')]
-                    for name in imported_names:
-                        if ' as ' in name:
-                            name = name.split(' as ')[1].strip()
-                        name = name.split('.')[0]  # Handle module.submodule
-                        if name and not re.search(rf'\b{re.escape(name)}\b', content.split('\n', 1)[1]):
-                            style_issues.append({
-                                'file': file_path,
-                                'issue': f'Potentially unused import: {name}',
-                                'severity': 'info'
-                            })
-                
-                # Check function/class naming conventions
-                tree = ast.parse(content)
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.FunctionDef):
-                        if not re.match(r'^[a-z_][a-z0-9_]*$', node.name) and not node.name.startswith('_'):
-                            style_issues.append({
-                                'file': file_path,
-                                'line': node.lineno,
-                                'issue': f'Function name "{node.name}" should be snake_case',
-                                'severity': 'info'
-                            })
-                    elif isinstance(node, ast.ClassDef):
-                        if not re.match(r'^[A-Z][a-zA-Z0-9]*$', node.name):
-                            style_issues.append({
-                                'file': file_path,
-                                'line': node.lineno,
-                                'issue': f'Class name "{node.name}" should be PascalCase',
-                                'severity': 'info'
-                            })
-                
-            except (SyntaxError, UnicodeDecodeError):
-                continue
+        style_issues = [issue for result in self._scan() for issue in result['style']]
         
         return {
             'style_issues': style_issues,
@@ -255,74 +534,8 @@ class PythonAnalyzer:
     
     def check_best_practices(self) -> Dict:
         """Check Python best practices and potential issues."""
-        issues = []
-        
-        for py_file in self.python_files:
-            try:
-                with open(py_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                
-                file_path = str(py_file.relative_to(self.source_dir))
-                tree = ast.parse(content)
-                
-                # Check for bare except clauses
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.ExceptHandler) and node.type is None:
-                        issues.append({
-                            'file': file_path,
-                            'line': node.lineno,
-                            'issue': 'Bare except clause (specify exception type)',
-                            'severity': 'warning'
-                        })
-                
-                # Check for mutable default arguments
-                for node in ast.walk(tree):
-                    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                        for default in node.args.defaults:
-                            if isinstance(default, (ast.List, ast.Dict, ast.Set)):
-                                issues.append({
-                                    'file': file_path,
-                                    'line': node.lineno,
-                                    'issue': f'Mutable default argument in function "{node.name}"',
-                                    'severity': 'error'
-                                })
-                
-                # Check for global variables (excluding constants)
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.Global):
-                        for name in node.names:
-                            if not name.isupper():
-                                issues.append({
-                                    'file': file_path,
-                                    'line': node.lineno,
-                                    'issue': f'Global variable "{name}" (consider alternatives)',
-                                    'severity': 'warning'
-                                })
-                
-                # Check for missing docstrings in public functions/classes
-                for node in ast.walk(tree):
-                    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                        if not node.name.startswith('_') and not ast.get_docstring(node):
-                            issues.append({
-                                'file': file_path,
-                                'line': node.lineno,
-                                'issue': f'Missing docstring in {type(node).__name__.lower().replace("def", "")} "{node.name}"',
-                                'severity': 'info'
-                            })
-                
-                # Check for TODO/FIXME comments
-                lines = content.split('\n')
-                for i, line in enumerate(lines, 1):
-                    if re.search(r'#.*\b(TODO|FIXME|XXX)\b', line, re.IGNORECASE):
-                        issues.append({
-                            'file': file_path,
-                            'line': i,
-                            'issue': 'TODO/FIXME comment found',
-                            'severity': 'info'
-                        })
-                
-            except (SyntaxError, UnicodeDecodeError):
-                continue
+        issues = [issue for result in self._scan() if result['best_practices'] is not None
+                  for issue in result['best_practices']]
         
         return {
             'issues': issues,
@@ -334,65 +547,8 @@ class PythonAnalyzer:
     
     def analyze_performance_patterns(self) -> Dict:
         """Check for common performance issues in Python."""
-        performance_issues = []
-        
-        for py_file in self.python_files:
-            try:
-                with open(py_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                
-                file_path = str(py_file.relative_to(self.source_dir))
-                tree = ast.parse(content)
-                
-                # Check for string concatenation in loops
-                for node in ast.walk(tree):
-                    if isinstance(node, (ast.For, ast.While)):
-                        for child in ast.walk(node):
-                            if isinstance(child, ast.AugAssign) and isinstance(child.op, ast.Add):
-                                if isinstance(child.target, ast.Name):
-                                    performance_issues.append({
-                                        'file': file_path,
-                                        'line': child.lineno,
-                                        'issue': 'String concatenation in loop (consider join() or f-strings)',
-                                        'impact': 'high'
-                                    })
-                
-                # Check for inefficient list operations
-                lines = content.split('\n')
-                for i, line in enumerate(lines, 1):
-                    # Check for list.append() in loops when list comprehension could be used
-                    if re.search(r'for .+ in .+:\s*\n\s*\w+\.append\(', '\n'.join(lines[max(0, i-2):i+2])):
-                        performance_issues.append({
-                            'file': file_path,
-                            'line': i,
-                            'issue': 'Consider using list comprehension instead of append in loop',
-                            'impact': 'medium'
-                        })
-                
-                # Check for repeated computation
-                for node in ast.walk(tree):
-                    if isinstance(node, (ast.For, ast.While)):
-                        # Look for function calls that could be moved outside the loop
-                        for child in ast.walk(node):
-                            if isinstance(child, ast.Call) and isinstance(child.func, ast.Attribute):
-                                if isinstance(child.func.attr, str) and child.func.attr in ['len', 'max', 'min']:
-                                    performance_issues.append({
-                                        'file': file_path,
-                                        'line': getattr(child, 'lineno', 0),
-                                        'issue': f'Repeated {child.func.attr}() call in loop (consider caching)',
-                                        'impact': 'medium'
-                                    })
-                
-                # Check for inefficient membership testing
-                if re.search(r'\bin\s+\[.*\]', content):
-                    performance_issues.append({
-                        'file': file_path,
-                        'issue': 'Membership test on list (consider using set)',
-                        'impact': 'medium'
-                    })
-                
-            except (SyntaxError, UnicodeDecodeError):
-                continue
+        performance_issues = [issue for result in self._scan() if result['performance'] is not None
+                              for issue in result['performance']]
         
         return {
             'performance_issues': performance_issues,
@@ -410,52 +566,15 @@ class PythonAnalyzer:
         local_imports = set()
         circular_dependencies = []
         
-        # Common Python standard library modules
-        stdlib_modules = {
-            'os', 'sys', 'json', 're', 'math', 'random', 'datetime', 'time',
-            'pathlib', 'collections', 'itertools', 'functools', 'typing',
-            'unittest', 'logging', 'argparse', 'subprocess', 'threading',
-            'multiprocessing', 'asyncio', 'ast', 'inspect', 'pickle', 'csv'
-        }
-        
-        for py_file in self.python_files:
-            try:
-                with open(py_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                
-                tree = ast.parse(content)
-                file_path = str(py_file.relative_to(self.source_dir))
-                file_imports = []
-                
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            module = alias.name.split('.')[0]
-                            file_imports.append(module)
-                            
-                            if module in stdlib_modules:
-                                stdlib_imports.add(module)
-                            elif '.' in alias.name or module.startswith('.'):
-                                local_imports.add(module)
-                            else:
-                                third_party_imports.add(module)
-                    
-                    elif isinstance(node, ast.ImportFrom):
-                        if node.module:
-                            module = node.module.split('.')[0]
-                            file_imports.append(module)
-                            
-                            if module in stdlib_modules:
-                                stdlib_imports.add(module)
-                            elif node.level > 0 or module.startswith('.'):
-                                local_imports.add(module)
-                            else:
-                                third_party_imports.add(module)
-                
-                imports[file_path] = list(set(file_imports))
-                
-            except (SyntaxError, UnicodeDecodeError):
+        for result in self._scan():
+            if result['imports'] is None:
                 continue
+            
+            file_imports, file_stdlib, file_third_party, file_local = result['imports']
+            stdlib_imports.update(file_stdlib)
+            third_party_imports.update(file_third_party)
+            local_imports.update(file_local)
+            imports[result['file']] = file_imports
         
         return {
             'file_imports': imports,
@@ -470,60 +589,7 @@ class PythonAnalyzer:
     
     def analyze_security_issues(self) -> Dict:
         """Check for potential security issues."""
-        security_issues = []
-        
-        for py_file in self.python_files:
-            try:
-                with open(py_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                
-                file_path = str(py_file.relative_to(self.source_dir))
-                
-                # Check for eval() usage
-                if 'eval(' in content:
-                    security_issues.append({
-                        'file': file_path,
-                        'issue': 'Use of eval() function (security risk)',
-                        'severity': 'high'
-                    })
-                
-                # Check for exec() usage
-                if 'exec(' in content:
-                    security_issues.append({
-                        'file': file_path,
-                        'issue': 'Use of exec() function (security risk)',
-                        'severity': 'high'
-                    })
-                
-                # Check for shell=True in subprocess
-                if re.search(r'subprocess\.[^(]*\([^)]*shell\s*=\s*True', content):
-                    security_issues.append({
-                        'file': file_path,
-                        'issue': 'subprocess with shell=True (command injection risk)',
-                        'severity': 'medium'
-                    })
-                
-                # Check for hardcoded passwords/secrets
-                lines = content.split('\n')
-                for i, line in enumerate(lines, 1):
-                    if re.search(r'(password|secret|key|token)\s*=\s*["\'](?!.*\{|\$)', line, re.IGNORECASE):
-                        security_issues.append({
-                            'file': file_path,
-                            'line': i,
-                            'issue': 'Potential hardcoded secret',
-                            'severity': 'medium'
-                        })
-                
-                # Check for SQL string formatting
-                if re.search(r'(SELECT|INSERT|UPDATE|DELETE).*%.*', content, re.IGNORECASE):
-                    security_issues.append({
-                        'file': file_path,
-                        'issue': 'Potential SQL injection vulnerability (use parameterized queries)',
-                        'severity': 'high'
-                    })
-                
-            except (SyntaxError, UnicodeDecodeError):
-                continue
+        security_issues = [issue for result in self._scan() for issue in result['security']]
         
         return {
             'security_issues': security_issues,
@@ -535,43 +601,33 @@ class PythonAnalyzer:
     
     def calculate_quality_score(self, complexity, metrics, style, best_practices, performance, security) -> Dict:
         """Calculate an overall quality score (0-100)."""
+        avg_complexity = complexity['average_complexity']
+        docstring_ratio = metrics['docstring_ratio']
+        
         score = 100
         
         # Deduct points for high complexity
-        if complexity['average_complexity'] > 15:
-            score -= 25
-        elif complexity['average_complexity'] > 10:
-            score -= 15
-        elif complexity['average_complexity'] > 5:
-            score -= 5
+        score -= (25 if avg_complexity > 15 else 15 if avg_complexity > 10
+                  else 5 if avg_complexity > 5 else 0)
         
         # Deduct points for low documentation
-        if metrics['docstring_ratio'] < 0.1:
-            score -= 20
-        elif metrics['docstring_ratio'] < 0.2:
-            score -= 10
-        
-        if metrics['comment_ratio'] < 0.05:
-            score -= 10
+        score -= 20 if docstring_ratio < 0.1 else 10 if docstring_ratio < 0.2 else 0
+        score -= 10 if metrics['comment_ratio'] < 0.05 else 0
         
         # Deduct points for style issues
-        score -= min(style['warnings'] * 2, 20)
-        score -= min(style['info'] * 1, 10)
+        score -= min(style['warnings'] * 2, 20) + min(style['info'], 10)
         
         # Deduct points for best practice violations
-        score -= best_practices['errors'] * 15
-        score -= best_practices['warnings'] * 8
-        score -= best_practices['info'] * 2
+        score -= (best_practices['errors'] * 15 + best_practices['warnings'] * 8
+                  + best_practices['info'] * 2)
         
         # Deduct points for performance issues
-        score -= performance['high_impact'] * 20
-        score -= performance['medium_impact'] * 10
-        score -= performance['low_impact'] * 5
+        score -= (performance['high_impact'] * 20 + performance['medium_impact'] * 10
+                  + performance['low_impact'] * 5)
         
         # Deduct points for security issues
-        score -= security['high_severity'] * 25
-        score -= security['medium_severity'] * 15
-        score -= security['low_severity'] * 5
+        score -= (security['high_severity'] * 25 + security['medium_severity'] * 15
+                  + security['low_severity'] * 5)
         
         score = max(0, score)  # Ensure score doesn't go below 0
         
@@ -627,7 +683,7 @@ class PythonAnalyzer:
             complexity, metrics, style, best_practices, performance, security
         )
         
-        return {
+        report = {
             'source_directory': str(self.source_dir),
             'complexity_analysis': complexity,
             'code_metrics': metrics,
@@ -638,6 +694,11 @@ class PythonAnalyzer:
             'security_analysis': security,
             'quality_score': quality_score
         }
+        if self.cache_dir is not None:
+            hits = sum(1 for result in self._scan() if result['cache_hit'])
+            misses = sum(1 for result in self._scan() if result['cache_hit'] is False)
+            report['ast_cache'] = {'hits': hits, 'misses': misses}
+        return report
 
 
 class ComplexityAnalyzer(ast.NodeVisitor):
@@ -722,12 +783,338 @@ class ComplexityAnalyzer(ast.NodeVisitor):
         }
 
 
+def _visit_leaf(visitor, node):
+    """UnifiedAnalyzer handler for nodes without children."""
+
+
+class UnifiedAnalyzer(ComplexityAnalyzer):
+    """Single AST pass that gathers complexity along with the inputs of every other check.
+    
+    Issues are kept per check so each analysis can report them in its own
+    order. A call or += inside nested loops is reported once per enclosing
+    loop, as walking each loop's subtree separately used to report it.
+    """
+    
+    def __init__(self, file_path: str):
+        super().__init__()
+        self.file_path = file_path
+        self.docstring_lines = set()
+        self.import_count = 0
+        # (top-level module name, whether the import is relative)
+        self.imported_modules = []
+        # (line, name bound by an import) and every name or attribute used
+        self.imported_names = []
+        self.used_names = set()
+        self.naming_issues = []
+        self.bare_excepts = []
+        self.mutable_defaults = []
+        self.global_names = []
+        self.missing_docstrings = []
+        self.loop_concats = []
+        self.loop_calls = []
+        # First line of each kind of call in _RISKY_CALLS
+        self.risky_calls = {}
+        self._loop_depth = 0
+    
+    # Handlers resolved per node type, called as handler(self, node)
+    _handlers = {}
+    
+    # Fields that can hold child nodes, per node type. 'ctx' is left out:
+    # it only ever holds a Load/Store/Del marker that no check looks at.
+    _child_fields = {}
+    
+    def _handler(self, node_type):
+        """Resolve and cache the handler for one node type."""
+        handler = getattr(type(self), 'visit_' + node_type.__name__, None)
+        if handler is None or handler is ast.NodeVisitor.visit_Constant:
+            # NodeVisitor.visit_Constant only forwards to the deprecated
+            # visit_Num/visit_Str handlers, none of which exist here
+            if node_type in _LEAF_TYPES or not node_type._fields:
+                handler = _visit_leaf
+            else:
+                handler = type(self).generic_visit
+        self._handlers[node_type] = handler
+        return handler
+    
+    def visit(self, node):
+        node_type = type(node)
+        handler = self._handlers.get(node_type) or self._handler(node_type)
+        return handler(self, node)
+    
+    def generic_visit(self, node):
+        """Visit the child nodes, reading each node's fields directly.
+        
+        Children are dispatched here rather than through visit(), which
+        saves a call per node.
+        """
+        node_type = type(node)
+        fields = self._child_fields.get(node_type)
+        if fields is None:
+            fields = tuple(field for field in node_type._fields if field != 'ctx')
+            self._child_fields[node_type] = fields
+        
+        handlers = self._handlers
+        for field in fields:
+            value = getattr(node, field, None)
+            if type(value) is list:
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        item_type = type(item)
+                        (handlers.get(item_type) or self._handler(item_type))(self, item)
+            elif isinstance(value, ast.AST):
+                value_type = type(value)
+                (handlers.get(value_type) or self._handler(value_type))(self, value)
+    
+    def _record_docstring(self, node) -> bool:
+        """Note the lines of node's docstring; return whether it has one."""
+        body = node.body
+        if not body:
+            return False
+        first = body[0]
+        if not (isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant)
+                and isinstance(first.value.value, str)):
+            return False
+        # ast.get_docstring() cleans the text before it is tested; only a
+        # docstring of nothing but whitespace can come out of that empty
+        docstring = first.value.value
+        if not docstring.strip() and not inspect.cleandoc(docstring):
+            return False
+        end_line = getattr(first, 'end_lineno', first.lineno)
+        if end_line:
+            self.docstring_lines.update(range(first.lineno, end_line + 1))
+        return True
+    
+    def _check_definition(self, node):
+        """Docstring check shared by functions and classes."""
+        if not self._record_docstring(node) and not node.name.startswith('_'):
+            self.missing_docstrings.append({
+                'file': self.file_path,
+                'line': node.lineno,
+                'issue': f'Missing docstring in {_NODE_KIND_NAME[type(node)]} "{node.name}"',
+                'severity': 'info'
+            })
+    
+    def visit_Module(self, node):
+        self._record_docstring(node)
+        self.generic_visit(node)
+    
+    def visit_FunctionDef(self, node):
+        # ComplexityAnalyzer routes async functions through here as well
+        if isinstance(node, ast.FunctionDef):
+            if not _SNAKE_CASE_RE.match(node.name) and not node.name.startswith('_'):
+                self.naming_issues.append({
+                    'file': self.file_path,
+                    'line': node.lineno,
+                    'issue': f'Function name "{node.name}" should be snake_case',
+                    'severity': 'info'
+                })
+        
+        for default in node.args.defaults:
+            if isinstance(default, (ast.List, ast.Dict, ast.Set)):
+                self.mutable_defaults.append({
+                    'file': self.file_path,
+                    'line': node.lineno,
+                    'issue': f'Mutable default argument in function "{node.name}"',
+                    'severity': 'error'
+                })
+        
+        self._check_definition(node)
+        super().visit_FunctionDef(node)
+    
+    def visit_ClassDef(self, node):
+        if not _PASCAL_CASE_RE.match(node.name):
+            self.naming_issues.append({
+                'file': self.file_path,
+                'line': node.lineno,
+                'issue': f'Class name "{node.name}" should be PascalCase',
+                'severity': 'info'
+            })
+        self._check_definition(node)
+        super().visit_ClassDef(node)
+    
+    def visit_ExceptHandler(self, node):
+        if node.type is None:
+            self.bare_excepts.append({
+                'file': self.file_path,
+                'line': node.lineno,
+                'issue': 'Bare except clause (specify exception type)',
+                'severity': 'warning'
+            })
+        super().visit_ExceptHandler(node)
+    
+    def visit_Global(self, node):
+        # Excluding constants
+        for name in node.names:
+            if not name.isupper():
+                self.global_names.append({
+                    'file': self.file_path,
+                    'line': node.lineno,
+                    'issue': f'Global variable "{name}" (consider alternatives)',
+                    'severity': 'warning'
+                })
+    
+    def visit_Import(self, node):
+        self.import_count += 1
+        for alias in node.names:
+            module = alias.name.partition('.')[0]
+            self.imported_modules.append((module, False))
+            self.imported_names.append((node.lineno, alias.asname or module))
+    
+    def visit_ImportFrom(self, node):
+        self.import_count += 1
+        if node.module:
+            self.imported_modules.append((node.module.partition('.')[0], node.level > 0))
+        for alias in node.names:
+            if alias.name != '*':
+                self.imported_names.append((node.lineno, alias.asname or alias.name))
+    
+    def visit_Name(self, node):
+        self.used_names.add(node.id)
+    
+    def visit_Attribute(self, node):
+        self.used_names.add(node.attr)
+        self.generic_visit(node)
+    
+    def visit_For(self, node):
+        self._loop_depth += 1
+        super().visit_For(node)
+        self._loop_depth -= 1
+    
+    def visit_While(self, node):
+        self._loop_depth += 1
+        super().visit_While(node)
+        self._loop_depth -= 1
+    
+    def _record_exports(self, value):
+        """Names listed in __all__ count as used: the module re-exports them."""
+        if isinstance(value, (ast.List, ast.Tuple)):
+            for element in value.elts:
+                if isinstance(element, ast.Constant) and isinstance(element.value, str):
+                    self.used_names.add(element.value)
+    
+    def visit_Assign(self, node):
+        if any(isinstance(target, ast.Name) and target.id == '__all__' for target in node.targets):
+            self._record_exports(node.value)
+        self.generic_visit(node)
+    
+    def visit_AugAssign(self, node):
+        if isinstance(node.target, ast.Name) and node.target.id == '__all__':
+            self._record_exports(node.value)
+        if self._loop_depth and isinstance(node.op, ast.Add) and isinstance(node.target, ast.Name):
+            self.loop_concats.extend({
+                'file': self.file_path,
+                'line': node.lineno,
+                'issue': 'String concatenation in loop (consider join() or f-strings)',
+                'impact': 'high'
+            } for _ in range(self._loop_depth))
+        self.generic_visit(node)
+    
+    def visit_Call(self, node):
+        func = node.func
+        if isinstance(func, ast.Name):
+            if func.id in ('eval', 'exec'):
+                self.risky_calls.setdefault(func.id, node.lineno)
+        elif (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name)
+                and func.value.id == 'subprocess'):
+            for keyword in node.keywords:
+                if (keyword.arg == 'shell' and isinstance(keyword.value, ast.Constant)
+                        and keyword.value.value is True):
+                    self.risky_calls.setdefault('shell', node.lineno)
+        
+        # Function calls that could be moved outside the loop
+        if (self._loop_depth and isinstance(node.func, ast.Attribute)
+                and node.func.attr in ('len', 'max', 'min')):
+            self.loop_calls.extend({
+                'file': self.file_path,
+                'line': getattr(node, 'lineno', 0),
+                'issue': f'Repeated {node.func.attr}() call in loop (consider caching)',
+                'impact': 'medium'
+            } for _ in range(self._loop_depth))
+        self.generic_visit(node)
+
+
+class IterativeAnalyzer(UnifiedAnalyzer):
+    """UnifiedAnalyzer for trees too deep to walk recursively.
+    
+    Nodes without a handler of their own, such as the operands of a long
+    chain of binary operators, are expanded on an explicit stack, in the
+    same order. So are the children of nodes in _TAIL_TYPES, such as a
+    long a.b().c().d() chain. Recursion is faster for ordinary files, so
+    this is only the fallback.
+    """
+    
+    # Node types whose handlers end by calling generic_visit(node) and do
+    # nothing after it; their children can go on the running walk's stack
+    # instead of starting a nested walk. Functions, classes and loops
+    # restore state once their body is done, so they still nest (the
+    # parser caps how deeply those statements can be nested).
+    _TAIL_TYPES = frozenset({
+        ast.Attribute, ast.Call, ast.BoolOp, ast.Assign, ast.AugAssign,
+        ast.If, ast.With, ast.Assert, ast.ExceptHandler,
+    })
+    
+    _handlers = {}
+    
+    # Child fields in reverse, so children come off the stack in order
+    _child_fields = {}
+    
+    def _push_children(self, node, stack):
+        """Push node's child nodes onto stack, last child first."""
+        node_type = type(node)
+        fields = self._child_fields.get(node_type)
+        if fields is None:
+            fields = tuple(field for field in reversed(node_type._fields) if field != 'ctx')
+            self._child_fields[node_type] = fields
+        
+        for field in fields:
+            value = getattr(node, field, None)
+            if type(value) is list:
+                for item in reversed(value):
+                    if isinstance(item, ast.AST):
+                        stack.append(item)
+            elif isinstance(value, ast.AST):
+                stack.append(value)
+    
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        # Stack of the walk that is calling a _TAIL_TYPES handler
+        self._tail_stack = None
+    
+    def generic_visit(self, node):
+        tail_stack = self._tail_stack
+        if tail_stack is not None:
+            # Called from a tail handler: let the running walk do the rest
+            self._tail_stack = None
+            self._push_children(node, tail_stack)
+            return
+        
+        handlers = self._handlers
+        tail_types = self._TAIL_TYPES
+        stack = []
+        self._push_children(node, stack)
+        while stack:
+            node = stack.pop()
+            node_type = type(node)
+            handler = handlers.get(node_type) or self._handler(node_type)
+            if handler is IterativeAnalyzer.generic_visit:
+                self._push_children(node, stack)
+            elif handler is not _visit_leaf:
+                if node_type in tail_types:
+                    self._tail_stack = stack
+                handler(self, node)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Analyze Python code quality and generate metrics')
     parser.add_argument('source_dir', help='Directory containing Python source files')
     parser.add_argument('-o', '--output', help='Output file for JSON report (default: stdout)')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
     parser.add_argument('--include-tests', action='store_true', help='Include test files in analysis')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Worker processes (default: one per CPU)')
+    parser.add_argument('--cache-dir',
+                        help='Keep parsed syntax trees here and reuse them for unchanged files; '
+                             'entries are pickles, so only use a directory you trust')
     
     args = parser.parse_args()
     
@@ -735,7 +1122,7 @@ def main():
         print(f"Error: Source directory '{args.source_dir}' does not exist")
         return 1
     
-    analyzer = PythonAnalyzer(args.source_dir)
+    analyzer = PythonAnalyzer(args.source_dir, max_workers=args.jobs, cache_dir=args.cache_dir)
     
     # Filter out test files if not explicitly included
     if not args.include_tests:
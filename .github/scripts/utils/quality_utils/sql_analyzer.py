@@ -9,37 +9,296 @@ import sys
 import re
 import json
 import argparse
+import functools
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
-import sqlparse
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import sqlparse
+except ImportError:
+    sqlparse = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+# Check patterns, matched against the upper-cased statement
+_SELECT_STAR_RE = re.compile(r'SELECT\s+\*')
+_FILTERED_STATEMENT_RE = re.compile(r'(SELECT|UPDATE|DELETE)\s')
+_LEADING_WILDCARD_RE = re.compile(r"LIKE\s+['\"]%[^'\"]+['\"]")
+_TRAILING_WILDCARD_RE = re.compile(r"LIKE\s+['\"]([^%][^'\"]*%)['\"]")
+_ANY_LEADING_WILDCARD_RE = re.compile(r"LIKE\s+['\"]%")
+_FUNCTION_ON_COLUMN_RES = (
+    re.compile(r'WHERE\s+\w*\([^\)]*\.\w+\)'),  # Function on column
+    re.compile(r'WHERE\s+(UPPER|LOWER|TRIM|SUBSTRING|DATE|YEAR|MONTH)\s*\(\w+\)'),
+)
+_NOT_IN_SUBQUERY_RE = re.compile(r'NOT\s+IN\s*\(\s*SELECT')
+_DISTINCT_SELECT_STAR_RE = re.compile(r'SELECT\s+DISTINCT\s+\*')
+# The keywords that are counted, UNION only when not followed by ALL. No
+# two of them can match at the same place, so one scan finds them all.
+_KEYWORD_RE = re.compile(r'\b(JOIN|OR|UNION(?!\s+ALL))\b')
+
+# Bump whenever a check changes so stale cache entries are not reused
+_CACHE_VERSION = b'2'
+
+# Statement splitting. These patterns follow sqlparse's lexer closely enough
+# to put statement boundaries where sqlparse.split() does; --strict still
+# runs sqlparse itself.
+_SPLIT_TOKEN_RE = re.compile(r"""
+    (?P<comment>(?:--|\#\ )[^\r\n]*(?:\r\n|\r|\n)? | /\*.*?\*/)
+  | (?P<other>
+        '(?:''|\\'|[^'])*' | "(?:""|\\"|[^"])*" | `(?:``|[^`])*` | ´(?:´´|[^´])*´
+      | (?<![\w\])])\[[^\]\[]+\]
+      | (?<![\w"$])(?P<tag>\$(?:[_A-ZÀ-Ü]\w*)?\$).*?(?-i:(?P=tag))
+      | %\(\w+\)s | (?<![\w:])[$:]\w+ | (?:@|\#\#?)[A-ZÀ-Ü]\w+ | \\\w+
+      | (?<![\w$\#])[+/@\#%^&|][+/@\#%^&|-]*
+    )
+  | (?<!\w)(?P<keyword>
+        (?:END(?:\s+(?:IF|LOOP|WHILE|FOR|CASE))? | IF\s+(?:NOT\s+)?EXISTS | HANDLER\s+FOR
+          | CREATE(?:\s+OR\s+REPLACE)? | GO\s\d+ | CASE)\b
+      | (?:BEGIN|DECLARE|FOR|WHILE|LOOP|DO|IF|GO|TRANSACTION|WORK|DEFERRED|IMMEDIATE|EXCLUSIVE)(?![\w$\#])
+    )
+  | (?P<punctuation>[();])
+""", re.VERBOSE | re.DOTALL | re.IGNORECASE)
+# What follows a word that sqlparse reads as a name, not a keyword
+_NAME_FOLLOWS_RE = re.compile(r'\(|\s*\.(?!\d)')
+# Whitespace and line comments after a ';' still belong to its statement
+_STATEMENT_TAIL_RE = re.compile(r'(?:[^\S\r\n]|(?:--|\#\ )(?!\+)[^\r\n]*(?:\r\n|\r|\n)?)*')
+_TRANSACTION_WORDS = frozenset({'TRANSACTION', 'WORK', 'DEFERRED', 'IMMEDIATE', 'EXCLUSIVE'})
+
+# The leading keyword that gives a statement its type
+_FIRST_TOKEN_RE = re.compile(r"""
+    (?:\s | (?:--|\#\ )[^\r\n]*(?:\r\n|\r|\n|$) | /\*.*?\*/)*
+    (?:(?P<create>CREATE(?:\s+OR\s+REPLACE)?)\b | (?P<word>[A-ZÀ-Ü]\w*)(?![$\#\w]))?
+""", re.VERBOSE | re.DOTALL | re.IGNORECASE)
+_DML_KEYWORDS = frozenset({
+    'SELECT', 'INSERT', 'DELETE', 'UPDATE', 'UPSERT', 'REPLACE', 'MERGE', 'COMMIT', 'ROLLBACK', 'START',
+})
+# CREATE has a pattern of its own
+_STATEMENT_KEYWORDS = _DML_KEYWORDS | {'DROP', 'ALTER', 'TRUNCATE'}
+# Parentheses, quoted text and comments to step over, and the words to look
+# at, when finding the statement a WITH clause leads into
+_CTE_TOKEN_RE = re.compile(r"""
+    (?P<comment>(?:--|\#\ )[^\r\n]*(?:\r\n|\r|\n)? | /\*.*?\*/)
+  | '(?:''|\\'|[^'])*' | "(?:""|\\"|[^"])*" | `(?:``|[^`])*`
+  | (?P<open>\() | (?P<close>\)) | (?<![\w$\#.])(?P<word>[A-ZÀ-Ü]\w*)(?![$\#\w])
+""", re.VERBOSE | re.DOTALL | re.IGNORECASE)
+
+
+def _statement_type(sql: str) -> str:
+    """The statement's leading DML or DDL keyword, upper-cased, or 'UNKNOWN'."""
+    m = _FIRST_TOKEN_RE.match(sql)
+    if m.group('create'):
+        return ' '.join(m.group('create').upper().split())
+    word = m.group('word')
+    if word is None or _NAME_FOLLOWS_RE.match(sql, m.end()):
+        return 'UNKNOWN'
+    word = word.upper()
+    if word in _STATEMENT_KEYWORDS:
+        return word
+    if word == 'WITH':
+        # The DML keyword right after the closing parenthesis of a common
+        # table expression
+        depth = 0
+        closed_at = None
+        for token in _CTE_TOKEN_RE.finditer(sql, m.end()):
+            if token.group('comment'):
+                if closed_at is not None and not sql[closed_at:token.start()].strip():
+                    closed_at = token.end()
+                continue
+            if token.group('open'):
+                depth += 1
+            elif token.group('close'):
+                depth = max(0, depth - 1)
+                if depth == 0:
+                    closed_at = token.end()
+                    continue
+            elif (token.group('word') and depth == 0 and closed_at is not None
+                    and not sql[closed_at:token.start()].strip()):
+                keyword = token.group('word').upper()
+                if keyword in _DML_KEYWORDS and not _NAME_FOLLOWS_RE.match(sql, token.end()):
+                    return keyword
+            closed_at = None
+    return 'UNKNOWN'
+
+
+def _split_statements(content: str) -> Iterator[Tuple[str, str]]:
+    """Yield (statement text, statement type) pairs, split as sqlparse would.
+    
+    A statement ends at a ';' outside quotes, comments, parentheses and
+    BEGIN ... END blocks, or at GO; whitespace and line comments after
+    the ';' on the same line stay with it.
+    """
+    start = 0
+    level = 0
+    block_stack = []
+    unconfirmed_start = None
+    is_create = False
+    seen_begin = False
+    last_end = 0
+    
+    for match in _SPLIT_TOKEN_RE.finditer(content):
+        if match.start() < start:
+            continue  # part of the tail of the last statement
+        kind = match.lastgroup
+        # Any token the pattern skipped since the last one clears seen_begin
+        skipped = last_end != match.start()
+        if seen_begin and skipped and content[last_end:match.start()].strip():
+            seen_begin = False
+        last_end = match.end()
+        if kind == 'comment':
+            # Optimizer hints are not plain comments to the splitter
+            if match.group().startswith(('--+', '# +', '/*+')):
+                seen_begin = False
+            continue
+        
+        value = match.group()
+        if kind == 'keyword':
+            unified = value.upper()
+            before = content[match.start() - 1:match.start()]
+            # A word after '.' or followed by '(' is a name; after '$' or
+            # '#' not closing a token it is the tail of a longer name
+            if unified != 'CASE' and (before == '.' or (skipped and before in ('$', '#')) or (
+                    len(unified.split()) == 1 and _NAME_FOLLOWS_RE.match(content, match.end()))):
+                kind = 'other'
+        
+        split = False
+        if kind == 'punctuation':
+            if value == ';':
+                unconfirmed_start = None
+                if seen_begin:
+                    seen_begin = False
+                    if block_stack and block_stack[-1] == 'BEGIN':
+                        block_stack.pop()
+                        level -= 1
+                split = level <= 0 and 'BEGIN' not in block_stack
+            elif value == '(':
+                level += 1
+            else:
+                level -= 1
+        elif kind == 'keyword':
+            if unified.startswith('CREATE'):
+                is_create = True
+            elif unified == 'DECLARE' and is_create and not block_stack:
+                block_stack.append('DECLARE')
+                level += 1
+            elif unified == 'BEGIN':
+                if block_stack and block_stack[-1] == 'DECLARE':
+                    block_stack[-1] = 'BEGIN'
+                else:
+                    block_stack.append('BEGIN')
+                    level += 1
+            elif seen_begin and unified in _TRANSACTION_WORDS:
+                if block_stack and block_stack[-1] == 'BEGIN':
+                    block_stack.pop()
+                    level -= 1
+            elif 'BEGIN' in block_stack and unified in ('FOR', 'WHILE'):
+                unconfirmed_start = unified
+            elif 'BEGIN' in block_stack and unified in ('LOOP', 'DO') and unconfirmed_start in ('FOR', 'WHILE'):
+                block_stack.append(unconfirmed_start)
+                unconfirmed_start = None
+                level += 1
+            elif 'BEGIN' in block_stack and unified in ('LOOP', 'IF', 'CASE'):
+                block_stack.append(unified)
+                level += 1
+            elif unified.startswith('END'):
+                closes = {'END IF': ('IF',), 'END FOR': ('FOR',), 'END WHILE': ('WHILE',),
+                          'END LOOP': ('LOOP', 'FOR', 'WHILE'), 'END CASE': ('CASE',)}.get(unified)
+                if unified == 'END':
+                    if block_stack:
+                        block_stack.pop()
+                    level -= 1
+                elif closes and block_stack and block_stack[-1] in closes:
+                    block_stack.pop()
+                    level -= 1
+            split = value.split()[0] == 'GO'
+        
+        seen_begin = kind == 'keyword' and unified == 'BEGIN' or (seen_begin and kind == 'comment')
+        
+        if split:
+            end = _STATEMENT_TAIL_RE.match(content, match.end()).end()
+            sql = content[start:end]
+            yield sql, _statement_type(sql)
+            start = end
+            level = 0
+            block_stack = []
+            unconfirmed_start = None
+            is_create = False
+            seen_begin = False
+    
+    if content[start:].strip():
+        sql = content[start:]
+        yield sql, _statement_type(sql)
+
+
+def _content_digest(content: str) -> str:
+    """Cache key for one file's SQL."""
+    if xxhash is not None:
+        hasher = xxhash.xxh3_64(_CACHE_VERSION)
+    else:
+        hasher = hashlib.blake2b(_CACHE_VERSION, digest_size=16)
+    hasher.update(content.encode('utf-8', errors='surrogatepass'))
+    return hasher.hexdigest()
 
 
 class SQLQualityAnalyzer:
     """Analyzes SQL queries for quality and best practices."""
     
-    def __init__(self, filepath: str):
+    def __init__(self, filepath: str, cache_dir: Optional[str] = None, strict: bool = False):
         self.filepath = filepath
         self.filename = Path(filepath).name
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.strict = strict
         self.score = 100
         self.issues = []
         self.warnings = []
         self.suggestions = []
         
     def analyze(self) -> Dict:
-        """Run all analysis checks on the SQL file."""
+        """Run all analysis checks on the SQL file.
+        
+        With a cache directory, reports are stored under a hash of the file's
+        contents and reused while it is unchanged; a report that cannot be
+        stored is returned uncached.
+        """
         try:
             with open(self.filepath, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Parse SQL statements
-            statements = sqlparse.parse(content)
-            
-            for idx, statement in enumerate(statements):
-                if statement.get_type() != 'UNKNOWN':
-                    self._analyze_statement(statement, idx + 1)
+            cache_file = None
+            if self.cache_dir is not None:
+                mode = '.strict' if self.strict else ''
+                cache_file = self.cache_dir / f"{_content_digest(content)}{mode}.json"
+                try:
+                    with open(cache_file, 'r', encoding='utf-8') as f:
+                        report = json.load(f)
+                    report['filepath'] = self.filepath
+                    report['filename'] = self.filename
+                    return report
+                except (OSError, ValueError):
+                    pass
             
-            return self._generate_report()
+            report = self._analyze_content(content)
             
+            if cache_file is not None:
+                # Write then rename so concurrent workers never read a partial entry
+                tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+                try:
+                    with open(tmp_file, 'w', encoding='utf-8') as f:
+                        json.dump(report, f)
+                    os.replace(tmp_file, cache_file)
+                except OSError:
+                    try:
+                        tmp_file.unlink()
+                    except OSError:
+                        pass
+            return report
+        
         except Exception as e:
             return {
                 'error': str(e),
@@ -47,16 +306,37 @@ class SQLQualityAnalyzer:
                 'score': 0
             }
     
-    def _analyze_statement(self, statement, statement_num: int):
+    def _analyze_content(self, content: str) -> Dict:
+        """Split the SQL into statements and run every check on each one.
+        
+        The checks only need statement text and type, so the built-in
+        splitter is used; strict mode parses with sqlparse instead. Either
+        way statements are produced one at a time, so only the current
+        one's text (or sqlparse token tree) is held in memory.
+        """
+        if self.strict:
+            statements = ((str(statement), statement.get_type())
+                          for statement in sqlparse.parsestream(content))
+        else:
+            statements = _split_statements(content)
+        
+        for idx, (sql, statement_type) in enumerate(statements):
+            if statement_type != 'UNKNOWN':
+                self._analyze_statement(sql, idx + 1)
+        
+        return self._generate_report()
+    
+    def _analyze_statement(self, sql: str, statement_num: int):
         """Analyze a single SQL statement."""
-        sql = str(statement).strip()
+        sql = sql.strip()
         sql_upper = sql.upper()
         
         # Skip comments and empty statements
-        if not sql or sql.startswith('--') or statement.get_type() == 'UNKNOWN':
+        if not sql or sql.startswith('--'):
             return
         
         context = f"Statement #{statement_num}"
+        keywords = _KEYWORD_RE.findall(sql_upper)
         
         # Check 1: SELECT * usage
         self._check_select_star(sql_upper, context)
@@ -71,7 +351,7 @@ class SQLQualityAnalyzer:
         self._check_functions_on_columns(sql_upper, context)
         
         # Check 5: Too many JOINs
-        self._check_join_count(sql_upper, context)
+        self._check_join_count(keywords, context)
         
         # Check 6: NOT IN with subquery
         self._check_not_in_subquery(sql_upper, context)
@@ -80,13 +360,13 @@ class SQLQualityAnalyzer:
         self._check_missing_limit(sql_upper, context)
         
         # Check 8: Multiple OR conditions
-        self._check_multiple_or(sql_upper, context)
+        self._check_multiple_or(keywords, context)
         
         # Check 9: DISTINCT with SELECT *
         self._check_distinct_select_star(sql_upper, context)
         
         # Check 10: UNION instead of UNION ALL
-        self._check_union_vs_union_all(sql_upper, context)
+        self._check_union_vs_union_all(keywords, context)
         
         # Check 11: ORDER BY without LIMIT
         self._check_order_by_without_limit(sql_upper, context)
@@ -96,7 +376,7 @@ class SQLQualityAnalyzer:
     
     def _check_select_star(self, sql: str, context: str):
         """Check for SELECT * usage."""
-        if re.search(r'SELECT\s+\*', sql):
+        if '*' in sql and _SELECT_STAR_RE.search(sql):
             self.score -= 10
             self.issues.append({
                 'type': 'SELECT_STAR',
@@ -109,7 +389,7 @@ class SQLQualityAnalyzer:
     
     def _check_missing_where(self, sql: str, context: str):
         """Check for missing WHERE clause in SELECT/UPDATE/DELETE."""
-        if re.search(r'(SELECT|UPDATE|DELETE)\s', sql):
+        if _FILTERED_STATEMENT_RE.search(sql):
             if 'WHERE' not in sql:
                 # Exception: Allow if it has LIMIT or if it's a simple lookup
                 if 'LIMIT' not in sql and 'JOIN' not in sql:
@@ -125,7 +405,11 @@ class SQLQualityAnalyzer:
     
     def _check_like_patterns(self, sql: str, context: str):
         """Check for LIKE patterns with leading wildcards."""
-        leading_wildcard = re.findall(r"LIKE\s+['\"]%[^'\"]+['\"]", sql)
+        # A substring test is much cheaper than running the pattern, and
+        # most statements have no LIKE
+        if 'LIKE' not in sql:
+            return
+        leading_wildcard = _LEADING_WILDCARD_RE.findall(sql)
         if leading_wildcard:
             self.score -= 15
             self.issues.append({
@@ -139,9 +423,11 @@ class SQLQualityAnalyzer:
     
     def _check_trailing_wildcard(self, sql: str, context: str):
         """Check for trailing wildcards (minor penalty)."""
+        if 'LIKE' not in sql:
+            return
         # Only trailing wildcard, not leading
-        trailing_only = re.findall(r"LIKE\s+['\"]([^%][^'\"]*%)['\"]", sql)
-        if trailing_only and not re.search(r"LIKE\s+['\"]%", sql):
+        trailing_only = _TRAILING_WILDCARD_RE.findall(sql)
+        if trailing_only and not _ANY_LEADING_WILDCARD_RE.search(sql):
             self.score -= 5
             self.warnings.append({
                 'type': 'TRAILING_WILDCARD',
@@ -154,14 +440,11 @@ class SQLQualityAnalyzer:
     
     def _check_functions_on_columns(self, sql: str, context: str):
         """Check for functions applied to columns in WHERE clause."""
-        # Common functions on columns in WHERE
-        patterns = [
-            r'WHERE\s+\w*\([^\)]*\.\w+\)',  # Function on column
-            r'WHERE\s+(UPPER|LOWER|TRIM|SUBSTRING|DATE|YEAR|MONTH)\s*\(\w+\)',
-        ]
-        
-        for pattern in patterns:
-            if re.search(pattern, sql):
+        # Common functions on columns in WHERE; both patterns need a call
+        if 'WHERE' not in sql or '(' not in sql:
+            return
+        for pattern in _FUNCTION_ON_COLUMN_RES:
+            if pattern.search(sql):
                 self.score -= 15
                 self.issues.append({
                     'type': 'FUNCTION_ON_COLUMN',
@@ -173,9 +456,9 @@ class SQLQualityAnalyzer:
                 })
                 break
     
-    def _check_join_count(self, sql: str, context: str):
+    def _check_join_count(self, keywords: List[str], context: str):
         """Check for excessive JOINs."""
-        join_count = len(re.findall(r'\bJOIN\b', sql))
+        join_count = keywords.count('JOIN')
         if join_count > 6:
             self.score -= 10
             self.issues.append({
@@ -189,7 +472,7 @@ class SQLQualityAnalyzer:
     
     def _check_not_in_subquery(self, sql: str, context: str):
         """Check for NOT IN with subquery."""
-        if re.search(r'NOT\s+IN\s*\(\s*SELECT', sql):
+        if 'NOT' in sql and _NOT_IN_SUBQUERY_RE.search(sql):
             self.score -= 10
             self.issues.append({
                 'type': 'NOT_IN_SUBQUERY',
@@ -203,8 +486,9 @@ class SQLQualityAnalyzer:
     def _check_missing_limit(self, sql: str, context: str):
         """Check for missing LIMIT clause."""
         if 'SELECT' in sql and 'LIMIT' not in sql:
-            # Don't penalize if it's a subquery or has TOP
-            if 'TOP ' not in sql and not re.search(r'\)\s*$', sql.strip()):
+            # Don't penalize if it's a subquery or has TOP; the statement
+            # was stripped before upper-casing
+            if 'TOP ' not in sql and not sql.endswith(')'):
                 self.score -= 10
                 self.warnings.append({
                     'type': 'MISSING_LIMIT',
@@ -215,9 +499,9 @@ class SQLQualityAnalyzer:
                     'suggestion': 'Add LIMIT clause to prevent large result sets'
                 })
     
-    def _check_multiple_or(self, sql: str, context: str):
+    def _check_multiple_or(self, keywords: List[str], context: str):
         """Check for multiple OR conditions."""
-        or_count = len(re.findall(r'\bOR\b', sql))
+        or_count = keywords.count('OR')
         if or_count > 3:
             self.score -= 10
             self.warnings.append({
@@ -231,7 +515,7 @@ class SQLQualityAnalyzer:
     
     def _check_distinct_select_star(self, sql: str, context: str):
         """Check for DISTINCT with SELECT *."""
-        if re.search(r'SELECT\s+DISTINCT\s+\*', sql):
+        if 'DISTINCT' in sql and _DISTINCT_SELECT_STAR_RE.search(sql):
             self.score -= 10
             self.issues.append({
                 'type': 'DISTINCT_SELECT_STAR',
@@ -242,10 +526,10 @@ class SQLQualityAnalyzer:
                 'suggestion': 'Use DISTINCT only on specific columns or consider GROUP BY'
             })
     
-    def _check_union_vs_union_all(self, sql: str, context: str):
+    def _check_union_vs_union_all(self, keywords: List[str], context: str):
         """Check for UNION instead of UNION ALL."""
         # Check if UNION is used but not UNION ALL
-        if re.search(r'\bUNION\b(?!\s+ALL)', sql):
+        if 'UNION' in keywords:
             self.score -= 5
             self.warnings.append({
                 'type': 'UNION_WITHOUT_ALL',
@@ -346,20 +630,95 @@ def format_text_report(report: Dict) -> str:
     return "\n".join(output)
 
 
+def _analyze_one(cache_dir: Optional[str], strict: bool, filepath: str) -> Dict:
+    """Analyze one file; module-level so worker processes can run it."""
+    return SQLQualityAnalyzer(filepath, cache_dir=cache_dir, strict=strict).analyze()
+
+
+def _batch_paths(args) -> List[str]:
+    """The files to analyze in batch mode: the --batch list or every .sql file under filepath."""
+    if args.batch is None:
+        return [str(path) for path in sorted(Path(args.filepath).rglob('*.sql'))]
+    
+    if args.batch == '-':
+        paths = [line.strip() for line in sys.stdin]
+    else:
+        with open(args.batch, 'r', encoding='utf-8') as f:
+            paths = [line.strip() for line in f]
+    return [path for path in paths if path]
+
+
+def _run_batch(paths: List[str], args) -> int:
+    """Analyze every file in paths; return the exit code."""
+    # One interpreter start-up for the whole list, with the files spread
+    # over worker processes; the analysis is pure Python, so threads would
+    # not help. Chunks cut the per-file IPC round trips.
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        worker = functools.partial(_analyze_one, args.cache_dir, args.strict)
+        reports = list(executor.map(worker, paths, chunksize=4))
+    
+    json_filename = args.output_json or 'sql_quality_reports.json'
+    with open(json_filename, 'w') as f:
+        json.dump(reports, f, indent=2)
+    print(f"JSON report saved to: {json_filename}")
+    
+    text_filename = args.output_text or 'sql_quality_reports.txt'
+    with open(text_filename, 'w') as f:
+        for report in reports:
+            if 'error' not in report:
+                f.write(format_text_report(report))
+                f.write("\n")
+    print(f"Text report saved to: {text_filename}")
+    
+    exit_code = 0
+    for report in reports:
+        if 'error' in report:
+            print(f"Error analyzing {report['filepath']}: {report['error']}", file=sys.stderr)
+            exit_code = 1
+        else:
+            print(f"{report['filepath']}: {report['overall_score']}/100 (Grade: {report['grade']})")
+            if report['overall_score'] < 70:
+                exit_code = 1
+    
+    return exit_code
+
+
 def main():
     parser = argparse.ArgumentParser(description='Analyze SQL query quality')
-    parser.add_argument('filepath', help='Path to SQL file to analyze')
+    parser.add_argument('filepath', nargs='?',
+                        help='Path to SQL file to analyze, or a directory to analyze every .sql file in')
     parser.add_argument('--output-json', help='Output JSON report to file')
     parser.add_argument('--output-text', help='Output text report to file')
+    parser.add_argument('--batch', metavar='FILE_LIST',
+                        help='Analyze every file listed in FILE_LIST, one path per line '
+                             '("-" reads the list from stdin)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Worker processes for --batch or a directory (default: one per CPU)')
+    parser.add_argument('--cache-dir',
+                        help='Reuse reports stored here for files whose contents are unchanged')
+    parser.add_argument('--strict', action='store_true',
+                        help='Split statements with sqlparse instead of the built-in splitter')
     
     args = parser.parse_args()
     
+    if args.strict and sqlparse is None:
+        parser.error('--strict requires sqlparse (pip install sqlparse)')
+    
+    if args.cache_dir:
+        os.makedirs(args.cache_dir, exist_ok=True)
+    
+    if args.batch is None and args.filepath is None:
+        parser.error('a filepath or --batch is required')
+    
+    if args.batch is not None or Path(args.filepath).is_dir():
+        sys.exit(_run_batch(_batch_paths(args), args))
+    
     if not Path(args.filepath).exists():
         print(f"Error: File not found: {args.filepath}", file=sys.stderr)
         sys.exit(1)
     
     # Run analysis
-    analyzer = SQLQualityAnalyzer(args.filepath)
+    analyzer = SQLQualityAnalyzer(args.filepath, cache_dir=args.cache_dir, strict=args.strict)
     report = analyzer.analyze()
     
     # Check for errors
@@ -0,0 +1,47 @@
+"""Regression tests for cpp_analyzer_dir."""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from cpp_analyzer_dir import _analyze_one, _content_digest
+
+
+class TestResultCache(unittest.TestCase):
+    """A cache entry that cannot be written must not fail the file."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.source_dir = Path(self._tmp.name) / 'src'
+        self.cache_dir = Path(self._tmp.name) / 'cache'
+        self.source_dir.mkdir()
+        self.cache_dir.mkdir()
+        self.cpp_file = self.source_dir / 'main.cpp'
+        self.cpp_file.write_bytes(b'int main() {\n    return 0;\n}\n')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_blocked_tmp_path(self):
+        digest = _content_digest(self.cpp_file.read_bytes(), False)
+        # A directory where the temporary entry would be written
+        (self.cache_dir / f'{digest}.{os.getpid()}.tmp').mkdir()
+
+        result = _analyze_one(self.source_dir, self.cache_dir, self.cpp_file)
+
+        self.assertEqual(result, _analyze_one(self.source_dir, None, self.cpp_file))
+        self.assertFalse((self.cache_dir / f'{digest}.json').exists())
+
+    def test_cache_round_trip(self):
+        first = _analyze_one(self.source_dir, self.cache_dir, self.cpp_file)
+        second = _analyze_one(self.source_dir, self.cache_dir, self.cpp_file)
+
+        # The entry is JSON, so the metrics tuple comes back as a list
+        self.assertEqual(json.loads(json.dumps(first)), second)
+        self.assertEqual([p.suffix for p in self.cache_dir.iterdir()], ['.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+"""Regression tests for the checks in cpp_scan shared by both C++ analyzers."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from cpp_analyzer import CppFileAnalyzer
+from cpp_analyzer_dir import _analyze_one
+from cpp_scan import scan
+
+
+ALLMAN = b'class Base\n{\npublic:\n    virtual void f();\n};\n'
+K_AND_R = b'class Base {\npublic:\n    virtual void f();\n};\n'
+
+
+class TestMissingVirtualDestructor(unittest.TestCase):
+    """Base classes are flagged wherever their opening brace sits."""
+
+    def test_allman_class(self):
+        self.assertTrue(scan(ALLMAN)['missing_virtual_destructor'])
+
+    def test_k_and_r_class(self):
+        self.assertTrue(scan(K_AND_R)['missing_virtual_destructor'])
+
+    def test_virtual_destructor(self):
+        content = b'class Base\n{\npublic:\n    virtual ~Base();\n    virtual void f();\n};\n'
+        self.assertFalse(scan(content)['missing_virtual_destructor'])
+
+    def test_forward_declaration(self):
+        content = b'class Base;\nvirtual_table_t table = { 0 };\n'
+        self.assertFalse(scan(content)['missing_virtual_destructor'])
+
+    def test_both_analyzers_flag_allman_class(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            header = Path(tmp) / 'base.hpp'
+            header.write_bytes(ALLMAN)
+
+            report = CppFileAnalyzer(str(header)).analyze()
+            types = [i['type'] for i in report['issues'] + report['warnings'] + report['info']]
+            self.assertIn('MISSING_VIRTUAL_DESTRUCTOR', types)
+
+            result = _analyze_one(Path(tmp), None, header)
+            issues = [i['issue'] for i in result['best_practices']]
+            self.assertIn('Class with virtual methods missing virtual destructor', issues)
+
+
+if __name__ == '__main__':
+    unittest.main()
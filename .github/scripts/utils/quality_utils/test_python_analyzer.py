@@ -0,0 +1,107 @@
+"""Regression tests for python_analyzer."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from python_analyzer import PythonFileAnalyzer, _content_digest
+
+
+SOURCE = '''"""A small module."""
+
+
+def add(a, b):
+    """Add two numbers."""
+    return a + b
+'''
+
+
+class TestReportCache(unittest.TestCase):
+    """A cache entry that cannot be written must not discard the report."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = Path(self._tmp.name)
+        self.cache_dir = self.tmp_dir / 'cache'
+        self.cache_dir.mkdir()
+        self.py_file = self.tmp_dir / 'module.py'
+        self.py_file.write_text(SOURCE)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_blocked_tmp_path(self):
+        digest = _content_digest(SOURCE)
+        # A directory where the temporary entry would be written
+        (self.cache_dir / f'{digest}.{os.getpid()}.tmp').mkdir()
+
+        report = PythonFileAnalyzer(str(self.py_file), cache_dir=str(self.cache_dir)).analyze()
+
+        self.assertNotIn('error', report)
+        self.assertEqual(report, PythonFileAnalyzer(str(self.py_file)).analyze())
+        self.assertFalse((self.cache_dir / f'{digest}.json').exists())
+
+
+class TestBatch(unittest.TestCase):
+    """--batch gives each file the report a single-file run would."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, name: str, content: bytes) -> str:
+        path = self.tmp_dir / name
+        path.write_bytes(content)
+        return str(path)
+
+    def _run_batch(self, paths):
+        file_list = self.tmp_dir / 'files.txt'
+        file_list.write_text('\n'.join(paths) + '\n')
+        json_file = self.tmp_dir / 'reports.json'
+        completed = subprocess.run(
+            [sys.executable, str(Path(__file__).with_name('python_analyzer.py')),
+             '--batch', str(file_list), '-j', '2',
+             '--output-json', str(json_file),
+             '--output-text', str(self.tmp_dir / 'reports.txt')],
+            capture_output=True, text=True, cwd=self.tmp_dir)
+        return completed.returncode, json.loads(json_file.read_text())
+
+    def test_reports_match_single_file_runs(self):
+        paths = [
+            self._write('first.py', SOURCE.encode()),
+            self._write('second.py', SOURCE.replace('add', 'subtract').encode()),
+            self._write('broken.py', b'def broken(:\n    pass\n'),
+            self._write('latin1.py', b'name = "caf\xe9"\n'),  # not valid UTF-8
+            str(self.tmp_dir / 'missing.py'),
+        ]
+
+        returncode, reports = self._run_batch(paths)
+
+        self.assertEqual(returncode, 1)
+        self.assertEqual([report['filepath'] for report in reports], paths)
+        for path, report in zip(paths, reports):
+            with self.subTest(path=Path(path).name):
+                expected = PythonFileAnalyzer(path).analyze()
+                self.assertEqual(report, json.loads(json.dumps(expected)))
+        self.assertEqual(['error' in report for report in reports],
+                         [False, False, True, True, True])
+
+    def test_clean_files_exit_zero(self):
+        paths = [self._write(f'module{i}.py', SOURCE.encode()) for i in range(20)]
+
+        returncode, reports = self._run_batch(paths)
+
+        self.assertEqual(returncode, 0)
+        self.assertEqual(len(reports), 20)
+        self.assertTrue(all(report['overall_score'] >= 70 for report in reports))
+
+
+if __name__ == '__main__':
+    unittest.main()
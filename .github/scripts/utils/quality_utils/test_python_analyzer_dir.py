@@ -0,0 +1,48 @@
+"""Regression tests for python_analyzer_dir on deeply nested source."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from python_analyzer_dir import _analyze_one
+
+
+class TestDeepNesting(unittest.TestCase):
+    """Files nested past the recursion limit must not abort the run."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.source_dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _analyze(self, source: str):
+        py_file = self.source_dir / 'deep.py'
+        py_file.write_text(source)
+        return _analyze_one(self.source_dir, None, py_file)
+
+    def test_deep_attribute_chain(self):
+        result = self._analyze('x = a' + '.b' * 800 + '\n')
+        self.assertNotIn('error', result['complexity'])
+        self.assertIsNotNone(result['metrics'])
+
+    def test_deep_call_chain(self):
+        result = self._analyze('x = f' + '()' * 800 + '\n')
+        self.assertNotIn('error', result['complexity'])
+
+    def test_deep_method_chain(self):
+        result = self._analyze('x = a' + '.b()' * 500 + '\n')
+        self.assertNotIn('error', result['complexity'])
+        self.assertIsNotNone(result['imports'])
+
+    def test_too_deep_to_parse(self):
+        # The parser itself gives up; the file gets an error entry instead
+        result = self._analyze('x = ' + '-' * 20000 + '1\n')
+        self.assertIn('error', result['complexity'])
+        self.assertIsNone(result['metrics'])
+        self.assertIsNotNone(result['style'])
+
+
+if __name__ == '__main__':
+    unittest.main()
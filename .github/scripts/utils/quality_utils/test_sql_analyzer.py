@@ -0,0 +1,113 @@
+"""Regression tests for sql_analyzer."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import sql_analyzer
+from sql_analyzer import SQLQualityAnalyzer, _content_digest, _split_statements
+
+try:
+    import sqlparse
+except ImportError:
+    sqlparse = None
+
+
+QUERY = 'SELECT id, name FROM users WHERE id = 1;\n'
+
+
+# Statement boundaries the built-in splitter must place where sqlparse does
+SPLIT_CORPUS = [
+    "SELECT 1; SELECT 2;",
+    "SELECT 'a;b' FROM t; SELECT \"x;y\" FROM u;",
+    "SELECT 'it''s; here' FROM t;\nSELECT 2",
+    "SELECT 1; -- trailing; comment\nSELECT 2;",
+    "-- leading; comment\nSELECT 1;\n# hash ; comment\nSELECT 2;",
+    "SELECT /* inline; comment */ 1; /* block\n; */ SELECT 2;",
+    "SELECT `a;b` FROM [t;x]; SELECT 3",
+    "CREATE FUNCTION f() RETURNS int AS $$ SELECT 1; SELECT 2; $$ LANGUAGE sql;\nSELECT f();",
+    "CREATE FUNCTION g() RETURNS void AS $body$\nBEGIN\n  UPDATE t SET a = 1;\nEND;\n$body$ LANGUAGE plpgsql;\nSELECT 1;",
+    "CREATE PROCEDURE p()\nBEGIN\n  SELECT 1;\n  SELECT 2;\nEND;\nSELECT 3;",
+    "CREATE OR REPLACE FUNCTION h() RETURNS int\nDECLARE\n  x int;\nBEGIN\n  x := 1;\n  IF x > 0 THEN\n    RETURN 1;\n  END IF;\n  RETURN 0;\nEND;\nSELECT h();",
+    "BEGIN; UPDATE t SET a = 1; COMMIT;",
+    "BEGIN TRANSACTION; DELETE FROM t; ROLLBACK;",
+    "SELECT CASE WHEN a > 1 THEN 'x;' ELSE 'y' END FROM t; SELECT CASE a WHEN 1 THEN 2 END;",
+    "CREATE PROCEDURE q()\nBEGIN\n  SELECT CASE WHEN a > 1 THEN 1 ELSE 2 END FROM t;\n  SELECT 2;\nEND;\nSELECT 3;",
+    "CREATE TABLE IF NOT EXISTS t (a int); DROP TABLE IF EXISTS t;",
+    "SELECT 1\nGO\nSELECT 2\nGO\n",
+    "SELECT 1\nGO 5\nSELECT 2",
+    "WITH cte AS (SELECT 1 AS a) SELECT * FROM cte; WITH x AS (SELECT 2), y AS (SELECT 3) INSERT INTO t SELECT * FROM x;",
+    "WITH RECURSIVE r(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM r WHERE n < 5) SELECT n FROM r;",
+    "INSERT INTO t (a, b) VALUES (1, ';'), (2, '(');\nUPDATE t SET b = ')' WHERE a = 1;",
+    "SELECT 1;;\n\n;SELECT 2",
+    "select lower(name) from users where id in (select id from admins); delete from logs",
+    "SELECT end_date, begin_time FROM t; SELECT t.begin, t.end FROM t;",
+    "",
+    "   \n  -- only a comment\n",
+]
+
+
+class TestReportCache(unittest.TestCase):
+    """A cache entry that cannot be written must not discard the report."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = Path(self._tmp.name)
+        self.cache_dir = self.tmp_dir / 'cache'
+        self.cache_dir.mkdir()
+        self.sql_file = self.tmp_dir / 'query.sql'
+        self.sql_file.write_text(QUERY)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_blocked_tmp_path(self):
+        digest = _content_digest(QUERY)
+        # A directory where the temporary entry would be written
+        (self.cache_dir / f'{digest}.{os.getpid()}.tmp').mkdir()
+
+        report = SQLQualityAnalyzer(str(self.sql_file), cache_dir=str(self.cache_dir)).analyze()
+
+        self.assertNotIn('error', report)
+        self.assertEqual(report, SQLQualityAnalyzer(str(self.sql_file)).analyze())
+        self.assertFalse((self.cache_dir / f'{digest}.json').exists())
+
+
+@unittest.skipIf(sqlparse is None, 'sqlparse is not installed')
+class TestSplitStatements(unittest.TestCase):
+    """The built-in splitter agrees with sqlparse."""
+
+    def test_boundaries_match_sqlparse(self):
+        for sql in SPLIT_CORPUS:
+            with self.subTest(sql=sql):
+                # sqlparse.split() strips each statement
+                ours = [statement.strip() for statement, _ in _split_statements(sql)]
+                self.assertEqual(ours, [s for s in sqlparse.split(sql) if s.strip()])
+
+    def test_types_match_sqlparse(self):
+        for sql in SPLIT_CORPUS:
+            with self.subTest(sql=sql):
+                ours = [statement_type for _, statement_type in _split_statements(sql)]
+                theirs = [statement.get_type() for statement in sqlparse.parse(sql)
+                          if str(statement).strip()]
+                self.assertEqual(ours, theirs)
+
+    def test_strict_uses_sqlparse(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            sql_file = Path(tmp) / 'queries.sql'
+            sql_file.write_text('\n'.join(SPLIT_CORPUS))
+            default = SQLQualityAnalyzer(str(sql_file)).analyze()
+
+            with mock.patch.object(sql_analyzer, '_split_statements',
+                                   side_effect=AssertionError('built-in splitter used')), \
+                    mock.patch.object(sqlparse, 'parsestream', wraps=sqlparse.parsestream) as parsestream:
+                strict = SQLQualityAnalyzer(str(sql_file), strict=True).analyze()
+
+            parsestream.assert_called_once()
+            self.assertEqual(strict, default)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,10 +10,14 @@ Version: 1.0.0
 """
 
 # Standard library imports
+import atexit
 import logging
+import os
 import sys
 import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
@@ -74,7 +78,8 @@ class Timer:
     
     Attributes:
         name: Name of the operation being timed
-        start_time: Timestamp when context was entered
+        start_time: time.perf_counter() reading when context was entered
+        end_time: time.perf_counter() reading when context was exited
         
     Example:
         >>> with Timer("data processing"):
@@ -91,10 +96,11 @@ class Timer:
         """
         self.name = name
         self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
         
     def __enter__(self) -> 'Timer':
         """Enter the context manager and start timing."""
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
         logger.info(f"Starting: {self.name}")
         return self
         
@@ -115,7 +121,8 @@ class Timer:
         Returns:
             False to propagate any exception that occurred
         """
-        elapsed = time.time() - (self.start_time or 0)
+        self.end_time = time.perf_counter()
+        elapsed = self.end_time - (self.start_time or 0)
         logger.info(f"Completed: {self.name} in {elapsed:.2f} seconds")
         return False
 
@@ -219,7 +226,8 @@ class ThreadSafeCounter:
     
     Attributes:
         _value: Current counter value
-        _lock: Threading lock for synchronization
+        _lock: Threading lock for synchronization, or None when the counter
+            was created with single_threaded=True
         
     Example:
         >>> counter = ThreadSafeCounter()
@@ -228,15 +236,17 @@ class ThreadSafeCounter:
         1
     """
     
-    def __init__(self, initial_value: int = 0) -> None:
+    def __init__(self, initial_value: int = 0, single_threaded: bool = False) -> None:
         """
         Initialize the thread-safe counter.
         
         Args:
             initial_value: Starting value for the counter
+            single_threaded: Skip locking because only one thread will ever
+                use this counter; sharing it between threads is then unsafe
         """
         self._value: int = initial_value
-        self._lock: threading.Lock = threading.Lock()
+        self._lock: Optional[threading.Lock] = None if single_threaded else threading.Lock()
         logger.debug(f"ThreadSafeCounter initialized with value: {initial_value}")
         
     def increment(self, amount: int = 1) -> int:
@@ -249,10 +259,17 @@ class ThreadSafeCounter:
         Returns:
             New counter value after increment
         """
-        with self._lock:
+        if self._lock is None:
             self._value += amount
-            logger.debug(f"Counter incremented to: {self._value}")
-            return self._value
+            new_value = self._value
+        else:
+            with self._lock:
+                self._value += amount
+                new_value = self._value
+        # Log outside the lock, and let logging format the message only if
+        # DEBUG is enabled, so other threads are not kept waiting
+        logger.debug("Counter incremented to: %d", new_value)
+        return new_value
             
     def decrement(self, amount: int = 1) -> int:
         """
@@ -264,10 +281,16 @@ class ThreadSafeCounter:
         Returns:
             New counter value after decrement
         """
-        with self._lock:
+        if self._lock is None:
             self._value -= amount
-            logger.debug(f"Counter decremented to: {self._value}")
-            return self._value
+            new_value = self._value
+        else:
+            with self._lock:
+                self._value -= amount
+                new_value = self._value
+        # Logged outside the lock, as in increment()
+        logger.debug("Counter decremented to: %d", new_value)
+        return new_value
             
     @property
     def value(self) -> int:
@@ -277,10 +300,78 @@ class ThreadSafeCounter:
         Returns:
             Current counter value
         """
+        if self._lock is None:
+            return self._value
         with self._lock:
             return self._value
 
 
+class BatchedCounter:
+    """
+    Counter that batches increments per thread before taking the lock.
+    
+    Each thread adds to its own thread-local subtotal and only flushes it
+    to a shared ThreadSafeCounter once it reaches flush_every, so threads
+    contend for the lock once per batch instead of once per increment.
+    Unflushed subtotals are not included in value: every thread must call
+    sync() when it is done counting.
+    
+    Attributes:
+        _total: Shared counter receiving the flushed subtotals
+        _local: Per-thread storage holding each thread's subtotal
+        _flush_every: Subtotal at which a thread flushes to _total
+        
+    Example:
+        >>> counter = BatchedCounter(flush_every=64)
+        >>> counter.increment()
+        >>> counter.sync()
+        >>> print(counter.value)
+        1
+    """
+    
+    def __init__(self, flush_every: int = 64) -> None:
+        """
+        Initialize the batched counter.
+        
+        Args:
+            flush_every: Number of increments a thread batches before
+                flushing them to the shared total
+        """
+        self._total = ThreadSafeCounter()
+        self._local = threading.local()
+        self._flush_every = flush_every
+        
+    def increment(self, amount: int = 1) -> None:
+        """
+        Add amount to the calling thread's subtotal, flushing it if full.
+        
+        Args:
+            amount: Amount to increment by
+        """
+        pending = getattr(self._local, 'pending', 0) + amount
+        if pending >= self._flush_every:
+            self._total.increment(pending)
+            pending = 0
+        self._local.pending = pending
+        
+    def sync(self) -> None:
+        """Flush the calling thread's remaining subtotal to the shared total."""
+        pending = getattr(self._local, 'pending', 0)
+        if pending:
+            self._total.increment(pending)
+            self._local.pending = 0
+            
+    @property
+    def value(self) -> int:
+        """
+        Get the flushed total.
+        
+        Returns:
+            Sum of all subtotals flushed so far
+        """
+        return self._total.value
+
+
 # ============================================================================
 # GENERIC CLASSES AND FUNCTIONS
 # ============================================================================
@@ -342,6 +433,36 @@ class DataProcessor(Generic[T]):
         return result
 
 
+# Worker pools reused by process_items, keyed by worker count, so only the
+# first parallel call pays for starting the worker processes
+_POOLS: Dict[int, ProcessPoolExecutor] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Get the shared process pool with max_workers workers, creating it once.
+    
+    Args:
+        max_workers: Number of worker processes in the pool
+        
+    Returns:
+        Process pool that stays alive until the interpreter exits
+    """
+    with _POOLS_LOCK:
+        pool = _POOLS.get(max_workers)
+        if pool is None:
+            pool = _POOLS[max_workers] = ProcessPoolExecutor(max_workers=max_workers)
+        return pool
+
+
+@atexit.register
+def _shutdown_pools() -> None:
+    """Shut down the process pools started by process_items."""
+    for pool in _POOLS.values():
+        pool.shutdown()
+
+
 def process_items(
     items: Sequence[T],
     processor: Callable[[T], K],
@@ -358,8 +479,11 @@ def process_items(
     Args:
         items: Sequence of items to process
         processor: Function to apply to each item
-        parallel: Whether to process items in parallel
-        max_workers: Maximum number of worker threads (if parallel=True)
+        parallel: Whether to process items in parallel worker processes;
+            processor and items must then be picklable (e.g. a module-level
+            function rather than a lambda)
+        max_workers: Maximum number of worker processes (if parallel=True),
+            defaults to the number of CPUs
         
     Returns:
         List of processed items
@@ -367,6 +491,7 @@ def process_items(
     Raises:
         ValueError: If max_workers is negative
         TypeError: If processor is not callable
+        BrokenProcessPool: If a worker process died during a parallel run
         
     Example:
         >>> items = [1, 2, 3, 4, 5]
@@ -384,9 +509,23 @@ def process_items(
     
     with Timer("Item processing"):
         if parallel:
-            # Parallel processing logic here
-            logger.info(f"Using parallel processing with {max_workers} workers")
-            result = [processor(item) for item in items]
+            workers = max_workers or os.cpu_count() or 1
+            logger.info(f"Using parallel processing with {workers} workers")
+            # Processes sidestep the GIL for CPU-bound processors; sending
+            # items in chunks (about four per worker) instead of one task
+            # per item keeps the pickling/IPC overhead down
+            chunksize = max(1, len(items) // (workers * 4))
+            pool = _get_pool(workers)
+            try:
+                result = list(pool.map(processor, items, chunksize=chunksize))
+            except BrokenProcessPool:
+                # A worker died and the pool cannot be used again; drop it
+                # so that the next call starts a new one
+                with _POOLS_LOCK:
+                    if _POOLS.get(workers) is pool:
+                        del _POOLS[workers]
+                pool.shutdown(wait=False)
+                raise
         else:
             result = [processor(item) for item in items]
             
@@ -499,6 +638,13 @@ class TestThreadSafeCounter(unittest.TestCase):
         self.counter.increment()
         self.assertEqual(self.counter.value, 1)
         
+    def test_single_threaded(self) -> None:
+        """Test counter without locking."""
+        counter = ThreadSafeCounter(10, single_threaded=True)
+        counter.increment(5)
+        counter.decrement()
+        self.assertEqual(counter.value, 14)
+        
     def test_increment_amount(self) -> None:
         """Test counter increment with custom amount."""
         self.counter.increment(5)
@@ -512,12 +658,33 @@ class TestThreadSafeCounter(unittest.TestCase):
         
     def test_thread_safety(self) -> None:
         """Test counter thread safety with multiple threads."""
-        def increment_many(counter: ThreadSafeCounter, times: int) -> None:
+        # Enough increments per thread that the threads really interleave
+        # (the interpreter switches threads every few milliseconds)
+        times = 10_000
+        done = [0] * 10
+        
+        def increment_many(counter: ThreadSafeCounter, index: int) -> None:
             for _ in range(times):
                 counter.increment()
-                
+            done[index] = times
+            
+        threads = [
+            threading.Thread(target=increment_many, args=(self.counter, index))
+            for index in range(10)
+        ]
+        
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+            
+        self.assertEqual(self.counter.value, sum(done))
+        self.assertEqual(self.counter.value, 10 * times)
+        
+    def test_thread_safety_amount(self) -> None:
+        """Test that one increment by an amount per thread adds up."""
         threads = [
-            threading.Thread(target=increment_many, args=(self.counter, 100))
+            threading.Thread(target=self.counter.increment, args=(100,))
             for _ in range(10)
         ]
         
@@ -529,6 +696,39 @@ class TestThreadSafeCounter(unittest.TestCase):
         self.assertEqual(self.counter.value, 1000)
 
 
+class TestBatchedCounter(unittest.TestCase):
+    """Unit tests for BatchedCounter class."""
+    
+    def test_sync_flushes_pending(self) -> None:
+        """Test that increments below the batch size appear after sync."""
+        counter = BatchedCounter(flush_every=64)
+        counter.increment(5)
+        self.assertEqual(counter.value, 0)
+        counter.sync()
+        self.assertEqual(counter.value, 5)
+        
+    def test_thread_safety(self) -> None:
+        """Test batched counter with multiple threads."""
+        counter = BatchedCounter(flush_every=64)
+        
+        def increment_many(times: int) -> None:
+            for _ in range(times):
+                counter.increment()
+            counter.sync()
+            
+        threads = [
+            threading.Thread(target=increment_many, args=(100,))
+            for _ in range(10)
+        ]
+        
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+            
+        self.assertEqual(counter.value, 1000)
+
+
 class TestDataProcessor(unittest.TestCase):
     """Unit tests for DataProcessor class."""
     
@@ -562,6 +762,20 @@ class TestProcessItems(unittest.TestCase):
         result = process_items(items, lambda x: x * 2)
         self.assertEqual(result, [2, 4, 6, 8, 10])
         
+    def test_process_items_parallel(self) -> None:
+        """Test parallel processing keeps the input order."""
+        items = list(range(-50, 50))
+        result = process_items(items, abs, parallel=True, max_workers=2)
+        self.assertEqual(result, [abs(item) for item in items])
+        
+    def test_process_items_parallel_after_worker_died(self) -> None:
+        """Test a dead worker does not break later parallel calls."""
+        with self.assertRaises(BrokenProcessPool):
+            process_items([1], os._exit, parallel=True, max_workers=2)
+        items = list(range(-50, 50))
+        result = process_items(items, abs, parallel=True, max_workers=2)
+        self.assertEqual(result, [abs(item) for item in items])
+        
     def test_process_items_invalid_processor(self) -> None:
         """Test error handling for invalid processor."""
         items = [1, 2, 3]
@@ -581,8 +795,9 @@ class TestContextManagers(unittest.TestCase):
     def test_timer_context_manager(self) -> None:
         """Test Timer context manager."""
         with Timer("test") as timer:
-            time.sleep(0.1)
+            sum(range(10_000))
         self.assertIsNotNone(timer.start_time)
+        self.assertGreater(timer.end_time, timer.start_time)
         
     def test_managed_resource(self) -> None:
         """Test managed_resource context manager."""